@@ -1,42 +1,185 @@
 """
 Some utility classes for numerically
 approximating calculus functions (integrals and derivatives)
+
+Both classes work on scalar signals, or with `shape` (or an ndarray `init`)
+on signals where every sample is an array, e.g. a video frame, which is then
+processed elementwise and updated in place.
 """
 
+from typing import Any, Optional, Sequence, Tuple, Union
+import numpy as np
+from nptyping import NDArray
+
+Value = Union[float, NDArray]
+
+
+def _state(init: Value,
+           shape: Optional[Tuple[int, ...]],
+           dtype: Any) -> Value:
+    """Scalar state, or a new array if `shape` is given or `init` is one."""
+    if shape is None and not isinstance(init, np.ndarray): return init
+    if shape is None: shape = np.shape(init)
+    return np.array(np.broadcast_to(init, shape), dtype=dtype)
+
+
+def _prepend(first: Value, ys: NDArray) -> NDArray:
+    """`ys` with `first` added as the first sample"""
+    return np.concatenate((np.reshape(first, (1, *ys.shape[1:])), ys))
+
+
+def _previous(last: Value, ys: NDArray) -> NDArray:
+    """For every sample in `ys`, the sample before it"""
+    return _prepend(last, ys[:-1])
+
+
+def _steps(dx: Union[float, Sequence[float], NDArray], ys: NDArray) -> NDArray:
+    """`dx` broadcastable against `ys`, per sample along the first axis"""
+    dx = np.asarray(dx, dtype=float)
+    return dx.reshape(dx.shape + (1,) * (ys.ndim - dx.ndim)) if dx.ndim else dx
+
 
 class Integrator:
     """Discrete/Numerical integration using trapezoid rule approximation."""
-    __sum: float
-    __last: float
+    __sum: Value
+    __last: Value
+    __tmp: Optional[NDArray] = None
+
+    def __init__(self,
+                 init: Value = 0,
+                 shape: Optional[Tuple[int, ...]] = None,
+                 dtype: Any = float):
+        """Init integrator
 
-    def __init__(self, init: float = 0):
-        self.__sum = init
-        self.__last = init
+        Args:
+            init (float | NDArray, optional): Initial value. Defaults to 0.
+            shape (Tuple[int, ...], optional): Shape of every sample, for
+            elementwise integration of arrays. Defaults to None (scalar), or
+            the shape of `init` if it is an array.
+            dtype (Any, optional): Data type of array state.
+            Defaults to float.
+        """
+        self.__sum = _state(init, shape, dtype)
+        self.__last = _state(init, shape, dtype)
+        if isinstance(self.__sum, np.ndarray):
+            self.__tmp = np.empty_like(self.__sum)
 
-    def next(self, y: float, dx: float) -> float:
-        self.__sum += dx * (y + (self.__last - y) / 2)
-        self.__last = y
+    def next(self, y: Value, dx: float) -> Value:
+        """Integrate the next sample. For array state, updates and returns
+        the state array in place, without allocating."""
+        tmp = self.__tmp
+        if tmp is None:
+            self.__sum += dx * (y + (self.__last - y) / 2)
+            self.__last = y
+            return self.__sum
+
+        np.subtract(self.__last, y, out=tmp)
+        tmp /= 2
+        tmp += y
+        tmp *= dx
+        self.__sum += tmp
+        self.__last[...] = y
         return self.__sum
 
+    def process(self,
+                ys: Union[Sequence[float], NDArray],
+                dx: Union[float, Sequence[float], NDArray]) -> NDArray:
+        """Integrate a block of samples, with the same result as calling
+        `next` for every sample. State is carried over between calls.
+
+        Args:
+            ys (Sequence[float] | NDArray): Block of samples, along the first
+            axis.
+            dx (float | Sequence[float] | NDArray): Step before every
+            sample, either constant or one per sample.
+
+        Returns:
+            NDArray: Integral value after every sample.
+        """
+        ys = np.asarray(ys, dtype=float)
+        if len(ys) == 0: return np.empty(ys.shape)
+
+        steps = _steps(dx, ys) * (ys + (_previous(self.__last, ys) - ys) / 2)
+        # Accumulate starting from the current sum, adding in the same order
+        # as `next` does.
+        sums = np.cumsum(_prepend(self.__sum, steps), axis=0)[1:]
+        if self.__tmp is None:
+            self.__sum = float(sums[-1])
+            self.__last = float(ys[-1])
+        else:
+            self.__sum[...] = sums[-1]
+            self.__last[...] = ys[-1]
+        return sums
+
     @property
-    def value(self):
+    def value(self) -> Value:
         return self.__sum
 
 
 class Derivator:
     """Discrete/Numerical derivation using backward finite difference."""
-    __last: float
-    __saved: float
+    __last: Value
+    __saved: Value
+    __array: bool = False
+
+    def __init__(self,
+                 init: Value = 0,
+                 shape: Optional[Tuple[int, ...]] = None,
+                 dtype: Any = float):
+        """Init derivator
 
-    def __init__(self, init: float = 0):
-        self.__last = init
-        self.__saved = init
+        Args:
+            init (float | NDArray, optional): Initial value. Defaults to 0.
+            shape (Tuple[int, ...], optional): Shape of every sample, for
+            elementwise derivation of arrays. Defaults to None (scalar), or
+            the shape of `init` if it is an array.
+            dtype (Any, optional): Data type of array state.
+            Defaults to float.
+        """
+        self.__last = _state(init, shape, dtype)
+        self.__saved = _state(init, shape, dtype)
+        self.__array = isinstance(self.__last, np.ndarray)
 
-    def next(self, y: float, dx: float) -> float:
-        self.__saved = (self.__last - y) / dx
-        self.__last = y
+    def next(self, y: Value, dx: float) -> Value:
+        """Derive at the next sample. For array state, updates and returns
+        the state array in place, without allocating."""
+        if not self.__array:
+            self.__saved = (self.__last - y) / dx
+            self.__last = y
+            return self.__saved
+
+        np.subtract(self.__last, y, out=self.__saved)
+        self.__saved /= dx
+        self.__last[...] = y
         return self.__saved
 
+    def process(self,
+                ys: Union[Sequence[float], NDArray],
+                dx: Union[float, Sequence[float], NDArray]) -> NDArray:
+        """Derive a block of samples, with the same result as calling
+        `next` for every sample. State is carried over between calls.
+
+        Args:
+            ys (Sequence[float] | NDArray): Block of samples, along the first
+            axis.
+            dx (float | Sequence[float] | NDArray): Step before every
+            sample, either constant or one per sample.
+
+        Returns:
+            NDArray: Derivative value at every sample.
+        """
+        ys = np.asarray(ys, dtype=float)
+        if len(ys) == 0: return np.empty(ys.shape)
+
+        diffs = (_previous(self.__last, ys) - ys) / _steps(dx, ys)
+        if not self.__array:
+            self.__saved = float(diffs[-1])
+            self.__last = float(ys[-1])
+        else:
+            self.__saved[...] = diffs[-1]
+            self.__last[...] = ys[-1]
+        return diffs
+
     @property
-    def value(self) -> float:
+    def value(self) -> Value:
         return self.__saved
@@ -2,7 +2,9 @@
 A collection of utility classes for signal processing.
 """
 
-from typing import Sequence, Any, Union
+from typing import Sequence, Any, Union, Optional, Callable
+from functools import reduce
+from heapq import heapify, heappush, heappop
 import numpy as np
 from nptyping import NDArray
 
@@ -11,9 +13,13 @@ class FlankDetector:
     """
     Generic utility class for detecting rising or falling edges in signals.
     """
+    LUT_LIMIT = 1 << 16
     __low: Sequence[Any]
     __high: Sequence[Any]
-    __last: int = 0
+    __low_values: tuple[Any, ...]
+    __high_values: tuple[Any, ...]
+    _last: int = 0
+    __lut: Optional[NDArray] = None
 
     def __init__(self,
                  lows: Union[Any, Sequence[Any]],
@@ -27,6 +33,20 @@ class FlankDetector:
         else:
             self.__high = (highs,)
 
+        # The block methods need sequences, lows and highs may be any
+        # iterable such as sets.
+        self.__low_values = tuple(self.__low)
+        self.__high_values = tuple(self.__high)
+
+        # Small non-negative integer domains are looked up by index in the
+        # block methods, instead of by comparing against every value.
+        values = (*self.__high_values, *self.__low_values)
+        if values and all(isinstance(v, (int, np.integer))
+                          and 0 <= v < self.LUT_LIMIT for v in values):
+            self.__lut = np.full(max(values) + 1, -1, dtype=np.int8)
+            self.__lut[np.array(self.__high_values, dtype=np.intp)] = 1
+            self.__lut[np.array(self.__low_values, dtype=np.intp)] = 0
+
     def is_rising(self, value: Any, strict=True) -> bool:
         """Returns True if the supplied value is a logical high
         and the previous value was a logical low.
@@ -46,7 +66,7 @@ class FlankDetector:
         Returns:
             bool: If signal goes from low to high.
         """
-        if self.__last == 0:
+        if self._last == 0:
             return self.step(value, strict) == 1
         self.step(value, strict)
         return False
@@ -70,7 +90,7 @@ class FlankDetector:
         Returns:
             bool: If signal goes from high to low.
         """
-        if self.__last == 1:
+        if self._last == 1:
             return self.step(value, strict) == 0
         self.step(value, strict)
         return False
@@ -88,7 +108,7 @@ class FlankDetector:
             Optional[bool]: Returns True if rising edge, False if falling edge
             or None if neither.
         """
-        last = self.__last
+        last = self._last
         step = self.step(value, strict)
 
         if last == 0 and step == 1: return True
@@ -114,17 +134,211 @@ class FlankDetector:
             int: Signals logical value (0 or 1 for low or high).
         """
         if value in self.__low:
-            self.__last = 0
-            return self.__last
+            self._last = 0
+            return self._last
         elif value in self.__high:
-            self.__last = 1
-            return self.__last
+            self._last = 1
+            return self._last
 
         if strict:
             raise ValueError('Value given which has not specified logical value.')  # noqa: E501
 
         return None
 
+    def rising_edges(self, block: Union[Sequence[Any], NDArray],
+                     strict=True) -> NDArray:
+        """Block version of `is_rising`, processing every value in order.
+
+        Args:
+            block (Sequence[Any] | NDArray): 1D block of signal values.
+            strict (bool, optional): Raise Exception if any value in the
+            block is neither low or high, before processing any value.
+            Undefined values are skipped if False. Defaults to True.
+
+        Raises:
+            ValueError: If strict and a value is undefined.
+
+        Returns:
+            NDArray: Indices of values in `block` that are rising edges.
+        """
+        return self.edges(block, strict)[0]
+
+    def falling_edges(self, block: Union[Sequence[Any], NDArray],
+                      strict=True) -> NDArray:
+        """Block version of `is_falling`, processing every value in order.
+
+        Args:
+            block (Sequence[Any] | NDArray): 1D block of signal values.
+            strict (bool, optional): Raise Exception if any value in the
+            block is neither low or high, before processing any value.
+            Undefined values are skipped if False. Defaults to True.
+
+        Raises:
+            ValueError: If strict and a value is undefined.
+
+        Returns:
+            NDArray: Indices of values in `block` that are falling edges.
+        """
+        return self.edges(block, strict)[1]
+
+    def edges(self, block: Union[Sequence[Any], NDArray],
+              strict=True) -> tuple[NDArray, NDArray]:
+        """Block version of `rising_or_falling`, processing every value in
+        order. The logical level is carried over between calls.
+
+        Args:
+            block (Sequence[Any] | NDArray): 1D block of signal values.
+            strict (bool, optional): Raise Exception if any value in the
+            block is neither low or high, before processing any value.
+            Undefined values are skipped if False. Defaults to True.
+
+        Raises:
+            ValueError: If strict and a value is undefined.
+
+        Returns:
+            tuple[NDArray, NDArray]: Indices of the rising edges and indices
+            of the falling edges in `block`.
+        """
+        levels = self._levels(np.asarray(block))
+        defined = levels >= 0
+        if strict and not np.all(defined):
+            raise ValueError('Value given which has not specified logical value.')  # noqa: E501
+        if len(levels) == 0: return np.empty(0, int), np.empty(0, int)
+
+        previous = np.empty(len(levels), dtype=np.int8)
+        previous[0] = self._last
+        previous[1:] = self.__hold(levels, defined)[:-1]
+
+        rising = np.flatnonzero(defined & (previous == 0) & (levels == 1))
+        falling = np.flatnonzero(defined & (previous == 1) & (levels == 0))
+        return rising, falling
+
+    def levels(self, block: Union[Sequence[Any], NDArray],
+               strict=True) -> NDArray:
+        """Block version of `step`, processing every value in order. The
+        logical level is carried over between calls.
+
+        Args:
+            block (Sequence[Any] | NDArray): 1D block of signal values.
+            strict (bool, optional): Raise Exception if any value in the
+            block is neither low or high, before processing any value.
+            Undefined values keep the previous logical value if False.
+            Defaults to True.
+
+        Raises:
+            ValueError: If strict and a value is undefined.
+
+        Returns:
+            NDArray: Logical value (0 or 1) after every value in `block`.
+        """
+        levels = self._levels(np.asarray(block))
+        defined = levels >= 0
+        if strict and not np.all(defined):
+            raise ValueError('Value given which has not specified logical value.')  # noqa: E501
+        if len(levels) == 0: return np.empty(0, dtype=np.int8)
+        return self.__hold(levels, defined)
+
+    def __hold(self, levels: NDArray, defined: NDArray) -> NDArray:
+        """Logical value after every value, undefined values holding the
+        previous one, and update the carried over level."""
+        # Index of the latest defined value at every position, -1 if none
+        latest = np.where(defined, np.arange(len(levels)), -1)
+        np.maximum.accumulate(latest, out=latest)
+        held = np.where(latest >= 0, levels[latest], self._last)
+        self._last = int(held[-1])
+        return held.astype(np.int8, copy=False)
+
+    def _levels(self, block: NDArray) -> NDArray:
+        """Logical value of every value in `block`, -1 where undefined."""
+        lut = self.__lut
+        if block.dtype.kind == 'b': block = block.view(np.uint8)
+        if lut is not None and block.dtype.kind in 'iu':
+            levels = np.full(block.shape, -1, dtype=np.int8)
+            inside = (block >= 0) & (block < len(lut))
+            levels[inside] = lut[block[inside]]
+            return levels
+
+        levels = np.full(block.shape, -1, dtype=np.int8)
+        levels[np.isin(block, self.__high_values)] = 1
+        levels[np.isin(block, self.__low_values)] = 0
+        return levels
+
+
+class SchmittTrigger(FlankDetector):
+    """Edge detection for numeric (analog) signals, with hysteresis.
+    https://en.wikipedia.org/wiki/Schmitt_trigger
+
+    A value at or above `high` is a logical high, a value at or below `low`
+    is a logical low and any value in between keeps the previous logical
+    value, so noise smaller than `high - low` does not cause edges. Values
+    are never undefined, `strict` is accepted but ignored."""
+    __low_threshold: float
+    __high_threshold: float
+
+    def __init__(self, low: float, high: float):
+        """Init trigger
+
+        Args:
+            low (float): Threshold at or below which the signal is low.
+            high (float): Threshold at or above which the signal is high.
+
+        Raises:
+            ValueError: If `low` is greater than `high`.
+        """
+        if low > high: raise ValueError('Low threshold is above high threshold.')  # noqa: E501
+        self.__low_threshold = low
+        self.__high_threshold = high
+
+    def step(self, value: float, strict=True) -> int:
+        """Process next signal value and return values logical value, either
+        low (0) or high (1)
+
+        Args:
+            value (float): Numeric signal value.
+            strict (bool, optional): Ignored. Defaults to True.
+
+        Returns:
+            int: Signals logical value (0 or 1 for low or high).
+        """
+        if value >= self.__high_threshold: self._last = 1
+        elif value <= self.__low_threshold: self._last = 0
+        return self._last
+
+    def edges(self, block: Union[Sequence[float], NDArray],
+              strict=True) -> tuple[NDArray, NDArray]:
+        """Block version of `rising_or_falling`, processing every value in
+        order. The logical level is carried over between calls.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            strict (bool, optional): Ignored. Defaults to True.
+
+        Returns:
+            tuple[NDArray, NDArray]: Indices of the rising edges and indices
+            of the falling edges in `block`.
+        """
+        return super().edges(block, False)
+
+    def levels(self, block: Union[Sequence[float], NDArray],
+               strict=True) -> NDArray:
+        """Block version of `step`, processing every value in order. The
+        logical level is carried over between calls.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            strict (bool, optional): Ignored. Defaults to True.
+
+        Returns:
+            NDArray: Logical value (0 or 1) after every value in `block`.
+        """
+        return super().levels(block, False)
+
+    def _levels(self, block: NDArray) -> NDArray:
+        levels = np.full(block.shape, -1, dtype=np.int8)
+        levels[block <= self.__low_threshold] = 0
+        levels[block >= self.__high_threshold] = 1
+        return levels
+
 
 class Filter:
     value: Union[int, float] = 0
@@ -136,11 +350,102 @@ class Filter:
     def __call__(self, value: float) -> float:
         raise NotImplementedError()
 
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values, oldest first, and get the
+        filter value after each of them. Equivalent to calling the filter
+        once per value, but subclasses may implement it vectorized.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Must have the same length as `block`. Defaults to None.
+
+        Returns:
+            NDArray: Filter value for every value in `block`.
+        """
+        block = np.asarray(block, dtype=float)
+        if out is None: out = np.empty(block.shape)
+        for i, v in enumerate(block):
+            out[i] = self(v)
+        return out
+
+    def _locked(self,
+                block: NDArray,
+                out: Optional[NDArray] = None) -> NDArray:
+        """Block result of a locked filter, i.e. the current value."""
+        if out is None:
+            return np.full(block.shape, self.value, dtype=block.dtype)
+        out[...] = self.value
+        return out
+
+    def _fir_weights(self) -> Optional[NDArray]:
+        """Weights of the equivalent FIR filter, for linear time-invariant
+        FIR filters only. None for any other filter."""
+        return None
 
-class SMAFilter(Filter):
+
+class _RingFilter(Filter):
+    """Base for filters over a fixed length window of the latest samples.
+
+    The window is kept in a preallocated circular buffer of twice the filter
+    length where every sample is written twice, so the current window is
+    always the contiguous view `_memory[_index:_index + _n]`, ordered from the
+    newest to the oldest sample. With `channels` every sample is a row of
+    one value per channel."""
+    _memory: NDArray
+    _index: int
+    _n: int
+    _ext: Optional[NDArray] = None
+
+    def __init__(self,
+                 n: int,
+                 init: Union[float, NDArray] = 0,
+                 channels: Optional[int] = None,
+                 dtype: Any = float):
+        if n < 1: raise ValueError('Filter length must be at least 1.')
+        self._n = n
+        self._index = 0
+        shape = (2 * n,) if channels is None else (2 * n, channels)
+        self._memory = np.full(shape, init, dtype=dtype)
+        self.lock = False
+
+    def _window(self) -> NDArray:
+        """View of the current window, newest sample first."""
+        return self._memory[self._index:self._index + self._n]
+
+    def _extend(self, block: NDArray) -> NDArray:
+        """Push a whole, non-empty, block into the window.
+
+        Returns:
+            NDArray: The `n - 1` samples of history preceding the block,
+            followed by the block, oldest first. Convolving this with the
+            filter weights in "valid" mode yields one value per sample.
+            It is a view of a buffer reused by the next call, sized for the
+            largest block so far.
+        """
+        n = self._n
+        size = n - 1 + len(block)
+        dtype = np.result_type(self._memory, block)
+        ext = self._ext
+        if ext is None or len(ext) < size or ext.dtype != dtype:
+            ext = self._ext = np.empty((size, *self._memory.shape[1:]), dtype)
+        ext = ext[:size]
+        if n > 1: ext[:n - 1] = self._window()[n - 2::-1]
+        ext[n - 1:] = block
+        window = ext[::-1][:n]
+        self._memory[:n] = window
+        self._memory[n:] = window
+        self._index = 0
+        return ext
+
+
+class SMAFilter(_RingFilter):
     """Simple Moving Average (SMA) filter
     https://en.wikipedia.org/wiki/Moving_average#Simple_moving_average"""
-    __memory: NDArray
+    __sum: float
+    __countdown: int
 
     def __init__(self, n: int, init: float = 0):
         """Init filter
@@ -150,8 +455,17 @@ class SMAFilter(Filter):
             init (int | float, optional): Initial value to fill the filter
             history with. Defaults to 0.
         """
-        self.__memory = np.full((n), init, dtype=float)
-        self.lock = False
+        super().__init__(n, init)
+        self.__resum()
+
+    def __resum(self) -> None:
+        # The running sum is recomputed from the window once every `n`
+        # samples, so floating point drift can not build up over time.
+        self.__sum = float(np.sum(self._window()))
+        self.__countdown = self._n
+
+    def _fir_weights(self) -> Optional[NDArray]:
+        return np.full(self._n, 1 / self._n)
 
     def __call__(self, v: float) -> float:
         """Processing the next signal value and get the new filter value.
@@ -164,21 +478,65 @@ class SMAFilter(Filter):
             float: Filters new value.
         """
         if not self.lock:
-            self.__memory = np.roll(self.__memory, 1, axis=0)
-            self.__memory[0] = v
-            self.value = float(np.average(self.__memory))
+            n = self._n
+            i = self._index - 1
+            if i < 0: i = n - 1
+            memory = self._memory
+            self.__sum += v - float(memory[i])
+            memory[i] = v
+            memory[i + n] = v
+            self._index = i
+            self.__countdown -= 1
+            if self.__countdown == 0: self.__resum()
+            self.value = self.__sum / n
         return self.value
 
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values, oldest first, with the same
+        result as calling the filter on each value. The filter history is
+        carried over between calls and `value` is set to the last output.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter value for every value in `block`.
+        """
+        block = np.asarray(block, dtype=float)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        ext = self._extend(block)
+        self.__resum()
+        r = np.convolve(ext, np.ones(self._n), 'valid')
+        if out is None: out = r
+        np.divide(r, self._n, out=out)
+        self.value = float(out[-1])
+        return out
+
 
-class FIRFilter(Filter):
+class FIRFilter(_RingFilter):
     """Simple Finite Impulse Response (FIR) filter implementation.
-    https://en.wikipedia.org/wiki/Finite_impulse_response"""
-    __memory: NDArray
+    https://en.wikipedia.org/wiki/Finite_impulse_response
+
+    Blocks given to `process` are filtered either by direct convolution or,
+    for long filters and blocks, with FFT based overlap-save convolution."""
+    MODE_AUTO = 0
+    MODE_DIRECT = 1
+    MODE_FFT = 2
+    FFT_THRESHOLD = 128
     __weights: NDArray
+    __auto: bool = False
+    __fft_size: int = 0
+    __fft_weights: NDArray
 
     def __init__(self,
                  weights: Union[Sequence[float], NDArray],
-                 init: float = 0):
+                 init: float = 0,
+                 mode: int = MODE_AUTO):
         """Init filter
 
         Args:
@@ -186,15 +544,498 @@ class FIRFilter(Filter):
             will be equal to the filters length.
             init (int | float, optional): Initial value to fill the filter
             history with. Defaults to 0.
+            mode (int, optional): How blocks are convolved, `MODE_DIRECT`,
+            `MODE_FFT` or `MODE_AUTO` to use FFT when the filter has at least
+            `FFT_THRESHOLD` weights and the block is long enough for FFT to
+            be cheaper. Defaults to MODE_AUTO.
+
+        Raises:
+            ValueError: Invalid weight array or mode.
+        """
+        self.__weights = np.array(weights, dtype=float)
+        s = self.__weights.shape
+        if len(s) != 1: raise ValueError('Weights must be a 1D array.')
+        if mode not in (FIRFilter.MODE_AUTO,
+                        FIRFilter.MODE_DIRECT,
+                        FIRFilter.MODE_FFT):
+            raise ValueError(f'Unknown FIR filter mode {mode}.')
+
+        super().__init__(s[0], init)
+
+        if mode == FIRFilter.MODE_FFT or \
+                (mode == FIRFilter.MODE_AUTO and s[0] >= self.FFT_THRESHOLD):
+            # Transform size of at least 4 times the filter length, so most
+            # of every transformed segment is valid output.
+            self.__fft_size = 1 << (4 * s[0] - 1).bit_length()
+            self.__fft_weights = np.fft.rfft(self.__weights,
+                                             self.__fft_size)
+            self.__auto = mode == FIRFilter.MODE_AUTO
+
+    def _fir_weights(self) -> Optional[NDArray]:
+        return self.__weights
+
+    def __use_fft(self, m: int) -> bool:
+        """If a block of `m` samples should be convolved with FFT"""
+        if not self.__auto: return self.__fft_size > 0
+        # Rough cost of direct convolution against the FFT of every segment,
+        # where a multiply-add is about 8 times cheaper than an FFT step.
+        n, size = self._n, self.__fft_size
+        segments = -(-m // (size - n + 1))
+        return m * n > 8 * segments * size * (size.bit_length() - 1)
+
+    def __fft_convolve(self, ext: NDArray) -> NDArray:
+        """Overlap-save equivalent of `np.convolve(ext, weights, 'valid')`"""
+        n, size = self._n, self.__fft_size
+        step = size - n + 1
+        m = len(ext) - n + 1
+        segments = -(-m // step)
+
+        padded = np.zeros((segments - 1) * step + size)
+        padded[:len(ext)] = ext
+        windows = np.lib.stride_tricks.sliding_window_view(padded, size)
+        spectra = np.fft.rfft(windows[::step], axis=1)
+        spectra *= self.__fft_weights
+        r = np.fft.irfft(spectra, size, axis=1)[:, n - 1:]
+        return r.reshape(-1)[:m]
+
+    def __call__(self, v: float) -> float:
+        """Processing the next signal value and get the new filter value.
+
+        Args:
+            v (int | float): Newest signal value to be processed.
+            Can be Any numerical value.
+
+        Returns:
+            float: Filters new value.
+        """
+        if not self.lock:
+            n = self._n
+            i = self._index - 1
+            if i < 0: i = n - 1
+            memory = self._memory
+            memory[i] = v
+            memory[i + n] = v
+            self._index = i
+            self.value = float(np.dot(memory[i:i + n], self.__weights))
+        return self.value
+
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values, oldest first, with the same
+        result as calling the filter on each value. The filter history is
+        carried over between calls and `value` is set to the last output.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter value for every value in `block`.
+        """
+        block = np.asarray(block, dtype=float)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        if self.__use_fft(len(block)):
+            r = self.__fft_convolve(self._extend(block))
+        else:
+            r = np.convolve(self._extend(block), self.__weights, 'valid')
+        if out is None: out = r
+        else: out[...] = r
+        self.value = float(out[-1])
+        return out
+
+
+class PercentileFilter(_RingFilter):
+    """Moving percentile (order statistic) filter, e.g. a moving median,
+    minimum (`q=0`) or maximum (`q=100`). Values between two samples are
+    linearly interpolated, same as `np.percentile`.
+
+    The window is split in two heaps holding the samples below and above the
+    requested rank. Evicted samples are deleted lazily, when they reach the
+    top of a heap, so every new sample is processed in O(log n).
+
+    Blocks given to `process` are handled in chunks of windows with at most
+    `CHUNK_SIZE` values in total, which bounds the memory used."""
+    CHUNK_SIZE = 1 << 20
+    __q: float
+    __rank: int
+    __frac: float
+    __low: list[float]
+    __high: list[float]
+    __low_size: int
+    __high_size: int
+    __delayed: dict[float, int]
+
+    def __init__(self, n: int, q: float, init: float = 0):
+        """Init filter
+
+        Args:
+            n (int): Length of the filter.
+            q (float): Percentile to compute, between 0 and 100.
+            init (int | float, optional): Initial value to fill the filter
+            history with. Defaults to 0.
+
+        Raises:
+            ValueError: Percentile out of range.
+        """
+        if not 0 <= q <= 100: raise ValueError('Percentile must be in [0, 100].')  # noqa: E501
+        super().__init__(n, init)
+        pos = (n - 1) * q / 100
+        self.__q = q
+        self.__rank = int(pos) + 1
+        self.__frac = pos - int(pos)
+        self.__rebuild()
+
+    def __rebuild(self) -> None:
+        window = sorted(self._window().tolist())
+        self.__low = [-x for x in window[:self.__rank]]
+        heapify(self.__low)
+        self.__high = window[self.__rank:]
+        self.__low_size = len(self.__low)
+        self.__high_size = len(self.__high)
+        self.__delayed = {}
+
+    def __prune(self, heap: list[float], sign: int) -> None:
+        delayed = self.__delayed
+        while heap:
+            x = sign * heap[0]
+            count = delayed.get(x)
+            if not count: return
+            if count == 1: del delayed[x]
+            else: delayed[x] = count - 1
+            heappop(heap)
+
+    def __insert(self, x: float) -> None:
+        if x <= -self.__low[0]:
+            heappush(self.__low, -x)
+            self.__low_size += 1
+        else:
+            heappush(self.__high, x)
+            self.__high_size += 1
+
+    def __erase(self, x: float) -> None:
+        self.__delayed[x] = self.__delayed.get(x, 0) + 1
+        if x <= -self.__low[0]:
+            self.__low_size -= 1
+            if x == -self.__low[0]: self.__prune(self.__low, -1)
+        else:
+            self.__high_size -= 1
+            if x == self.__high[0]: self.__prune(self.__high, 1)
+
+    def __balance(self) -> None:
+        low, high = self.__low, self.__high
+        while self.__low_size > self.__rank:
+            heappush(high, -heappop(low))
+            self.__low_size -= 1
+            self.__high_size += 1
+            self.__prune(low, -1)
+        while self.__low_size < self.__rank:
+            heappush(low, -heappop(high))
+            self.__low_size += 1
+            self.__high_size -= 1
+            self.__prune(high, 1)
+
+    def __current(self) -> float:
+        a = -self.__low[0]
+        t = self.__frac
+        if not t: return a
+        b = self.__high[0]
+        if t < 0.5: return a + (b - a) * t
+        return b - (b - a) * (1 - t)
+
+    def __call__(self, v: float) -> float:
+        """Processing the next signal value and get the new filter value.
+
+        Args:
+            v (int | float): Newest signal value to be processed.
+            Can be Any numerical value.
+
+        Returns:
+            float: Filters new value.
+        """
+        if not self.lock:
+            n = self._n
+            i = self._index - 1
+            if i < 0: i = n - 1
+            memory = self._memory
+            old = float(memory[i])
+            memory[i] = v
+            memory[i + n] = v
+            self._index = i
+
+            self.__insert(float(v))
+            self.__erase(old)
+            self.__balance()
+            # Samples deleted deep inside a heap may never reach its top,
+            # start over before they take up more space than the window.
+            if len(self.__low) + len(self.__high) > 2 * n: self.__rebuild()
+            self.value = self.__current()
+        return self.value
+
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values, oldest first, with the same
+        result as calling the filter on each value. The filter history is
+        carried over between calls and `value` is set to the last output.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter value for every value in `block`.
+        """
+        block = np.asarray(block, dtype=float)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        ext = self._extend(block)
+        self.__rebuild()
+        windows = np.lib.stride_tricks.sliding_window_view(ext, self._n)
+        if out is None: out = np.empty(len(block))
+        # np.percentile copies the windows it is given, so they are passed
+        # in chunks of at most CHUNK_SIZE values.
+        rows = max(1, self.CHUNK_SIZE // self._n)
+        for a in range(0, len(block), rows):
+            np.percentile(windows[a:a + rows], self.__q, axis=1,
+                          out=out[a:a + rows])
+        self.value = float(out[-1])
+        return out
+
+
+class MedianFilter(PercentileFilter):
+    """Moving median filter, a `PercentileFilter` at the 50th percentile."""
+
+    def __init__(self, n: int, init: float = 0):
+        """Init filter
+
+        Args:
+            n (int): Length of the filter.
+            init (int | float, optional): Initial value to fill the filter
+            history with. Defaults to 0.
+        """
+        super().__init__(n, 50, init)
+
+
+class SMAFilterBank(_RingFilter):
+    """Multi-channel `SMAFilter`, running the same filter on many independent
+    channels with one NumPy operation per sample."""
+    value: NDArray
+    __sum: NDArray
+    __countdown: int
+
+    def __init__(self,
+                 n: int,
+                 channels: int,
+                 init: Union[float, NDArray] = 0,
+                 dtype: Any = np.float64):
+        """Init filter bank
+
+        Args:
+            n (int): Length of the filter.
+            channels (int): Number of channels.
+            init (float | NDArray, optional): Initial value, or one value per
+            channel, to fill the filter history with. Defaults to 0.
+            dtype (Any, optional): Data type of the filter state and output,
+            e.g. `np.float32` or `np.float64`. Defaults to np.float64.
+        """
+        super().__init__(n, init, channels, dtype)
+        self.value = np.zeros(channels, dtype=dtype)
+        self.__resum()
+
+    def __resum(self) -> None:
+        self.__sum = np.sum(self._window(), axis=0)
+        self.__countdown = self._n
+
+    def __call__(self, v: Union[Sequence[float], NDArray]) -> NDArray:
+        """Processing the next sample of every channel.
+
+        Args:
+            v (Sequence[float] | NDArray): Newest signal value per channel.
+
+        Returns:
+            NDArray: Filters new value per channel.
+        """
+        if not self.lock:
+            n = self._n
+            i = self._index - 1
+            if i < 0: i = n - 1
+            memory = self._memory
+            self.__sum -= memory[i]
+            memory[i] = v
+            memory[i + n] = v
+            self.__sum += memory[i]
+            self._index = i
+            self.__countdown -= 1
+            if self.__countdown == 0: self.__resum()
+            self.value = self.__sum / n
+        return self.value
+
+    def process(self,
+                block: Union[Sequence[Sequence[float]], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of samples, with the same result as calling the
+        filter on each row. History is carried over between calls.
+
+        Args:
+            block (NDArray): Block of shape (samples, channels), oldest first.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter values of shape (samples, channels).
+        """
+        block = np.asarray(block, dtype=self._memory.dtype)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        ext = self._extend(block)
+        self.__resum()
+        csum = np.zeros((len(ext) + 1, ext.shape[1]))
+        np.cumsum(ext, axis=0, out=csum[1:])
+        r = csum[self._n:] - csum[:-self._n]
+        if out is None: out = np.empty_like(block)
+        np.divide(r, self._n, out=out, casting='same_kind')
+        self.value = out[-1].copy()
+        return out
+
+
+class FIRFilterBank(_RingFilter):
+    """Multi-channel `FIRFilter`, running the same filter on many independent
+    channels with one NumPy operation per sample."""
+    value: NDArray
+    __weights: NDArray
+
+    def __init__(self,
+                 weights: Union[Sequence[float], NDArray],
+                 channels: int,
+                 init: Union[float, NDArray] = 0,
+                 dtype: Any = np.float64):
+        """Init filter bank
+
+        Args:
+            weights (Sequence[float  |  int]): Filter weights, shared by all
+            channels.
+            channels (int): Number of channels.
+            init (float | NDArray, optional): Initial value, or one value per
+            channel, to fill the filter history with. Defaults to 0.
+            dtype (Any, optional): Data type of the filter state and output,
+            e.g. `np.float32` or `np.float64`. Defaults to np.float64.
 
         Raises:
             ValueError: Invalid weight array.
         """
-        self.__weights = np.array(weights)
+        self.__weights = np.array(weights, dtype=dtype)
         s = self.__weights.shape
-        if len(s) > 1: raise ValueError('Weights must be a 1D array.')
+        if len(s) != 1: raise ValueError('Weights must be a 1D array.')
+
+        super().__init__(s[0], init, channels, dtype)
+        self.value = np.zeros(channels, dtype=dtype)
+
+    def __call__(self, v: Union[Sequence[float], NDArray]) -> NDArray:
+        """Processing the next sample of every channel.
+
+        Args:
+            v (Sequence[float] | NDArray): Newest signal value per channel.
+
+        Returns:
+            NDArray: Filters new value per channel.
+        """
+        if not self.lock:
+            n = self._n
+            i = self._index - 1
+            if i < 0: i = n - 1
+            memory = self._memory
+            memory[i] = v
+            memory[i + n] = v
+            self._index = i
+            self.value = self.__weights @ memory[i:i + n]
+        return self.value
+
+    def process(self,
+                block: Union[Sequence[Sequence[float]], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of samples, with the same result as calling the
+        filter on each row. History is carried over between calls.
+
+        Args:
+            block (NDArray): Block of shape (samples, channels), oldest first.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter values of shape (samples, channels).
+        """
+        block = np.asarray(block, dtype=self._memory.dtype)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        ext = self._extend(block)
+        m, n = len(block), self._n
+        if out is None: out = np.empty_like(block)
+        # One multiply-add over the whole block per weight, which keeps the
+        # temporaries at the size of the block.
+        np.multiply(ext[n - 1:], self.__weights[0], out=out)
+        for k in range(1, n):
+            out += self.__weights[k] * ext[n - 1 - k:n - 1 - k + m]
+        self.value = out[-1].copy()
+        return out
+
+
+class IIRFilter(Filter):
+    """Infinite Impulse Response (IIR) filter, as a cascade of second-order
+    sections (biquads) in transposed direct form II.
+    https://en.wikipedia.org/wiki/Digital_biquad_filter
+
+    Blocks given to `process` are split into chunks of `BLOCK_SIZE` samples.
+    Every section filters all chunks at once as matrix products, using the
+    sections state-space form, so only the state between chunks is carried
+    over one chunk at a time."""
+    BLOCK_SIZE = 64
+    __coefs: list[tuple[float, float, float, float, float]]
+    __state: list[list[float]]
+    __matrices: list[tuple[NDArray, NDArray, NDArray, NDArray]]
+
+    def __init__(self,
+                 sos: Union[Sequence[Sequence[float]], NDArray],
+                 init: float = 0):
+        """Init filter
+
+        Args:
+            sos (Sequence[Sequence[float]] | NDArray): Second-order sections
+            of shape (sections, 6), each row being
+            `[b0, b1, b2, a0, a1, a2]`, same as used by `scipy.signal`.
+            init (int | float, optional): Initial value the filter is in
+            steady state with, as if it had been given only this value.
+            Defaults to 0.
 
-        self.__memory = np.full_like(weights, init, dtype=float)
+        Raises:
+            ValueError: Invalid second-order sections, or non-zero `init`
+            with a section that has a pole at DC (z=1).
+        """
+        sos = np.array(sos, dtype=float)
+        if sos.ndim == 1: sos = sos.reshape(1, -1)
+        if sos.ndim != 2 or sos.shape[1] != 6:
+            raise ValueError('Second-order sections must be of shape (n, 6).')
+        if np.any(sos[:, 3] == 0):
+            raise ValueError('Leading denominator coefficient can not be 0.')
+
+        sos = sos / sos[:, 3:4]
+        self.__coefs = [(b0, b1, b2, a1, a2)
+                        for b0, b1, b2, _, a1, a2 in sos.tolist()]
+        self.__matrices = []
+        self.__state = []
+        for b0, b1, b2, a1, a2 in self.__coefs:
+            if init == 0:
+                self.__state.append([0.0, 0.0])
+                continue
+            if 1 + a1 + a2 == 0:
+                raise ValueError('Section with a pole at DC has no steady state for a non-zero init.')  # noqa: E501
+            y = init * (b0 + b1 + b2) / (1 + a1 + a2)
+            z1 = b2 * init - a2 * y
+            self.__state.append([b1 * init - a1 * y + z1, z1])
+            init = y
         self.lock = False
 
     def __call__(self, v: float) -> float:
@@ -208,7 +1049,226 @@ class FIRFilter(Filter):
             float: Filters new value.
         """
         if not self.lock:
-            self.__memory = np.roll(self.__memory, 1, axis=0)
-            self.__memory[0] = v
-            self.value = float(np.sum(self.__memory * self.__weights))
+            for (b0, b1, b2, a1, a2), z in zip(self.__coefs, self.__state):
+                y = b0 * v + z[0]
+                z[0] = b1 * v - a1 * y + z[1]
+                z[1] = b2 * v - a2 * y
+                v = y
+            self.value = float(v)
+        return self.value
+
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values, oldest first, with the same
+        result as calling the filter on each value. The filter state is
+        carried over between calls and `value` is set to the last output.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Filter value for every value in `block`.
+        """
+        block = np.asarray(block, dtype=float)
+        if self.lock or len(block) == 0: return self._locked(block, out)
+
+        if not self.__matrices:
+            self.__matrices = [self.__section_matrices(c)
+                               for c in self.__coefs]
+        for z, matrices in zip(self.__state, self.__matrices):
+            block = self.__process_section(block, z, matrices)
+
+        if out is None: out = block
+        else: out[...] = block
+        self.value = float(out[-1])
+        return out
+
+    def __section_matrices(
+        self,
+        coefs: tuple[float, float, float, float, float],
+    ) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+        """State-space matrices of one section over a chunk of `L` samples.
+
+        Returns:
+            tuple: Impulse response Toeplitz matrix (L, L), state to output
+            matrix (L, 2), input to end state matrix (2, L) and the powers
+            of the state transition matrix (L + 1, 2, 2).
+        """
+        b0, b1, b2, a1, a2 = coefs
+        L = self.BLOCK_SIZE
+        A = np.array([[-a1, 1], [-a2, 0]])
+        B = np.array([b1 - a1 * b0, b2 - a2 * b0])
+
+        powers = np.empty((L + 1, 2, 2))
+        powers[0] = np.eye(2)
+        for k in range(L):
+            powers[k + 1] = A @ powers[k]
+
+        AB = powers[:L] @ B
+        h = np.concatenate(([b0], AB[:L - 1, 0]))
+        lag = np.subtract.outer(np.arange(L), np.arange(L))
+        toeplitz = np.where(lag >= 0, h[np.maximum(lag, 0)], 0)
+        return toeplitz, powers[:L, 0, :], AB[::-1].T, powers
+
+    def __process_section(
+        self,
+        x: NDArray,
+        z: list[float],
+        matrices: tuple[NDArray, NDArray, NDArray, NDArray],
+    ) -> NDArray:
+        toeplitz, observe, control, powers = matrices
+        L = self.BLOCK_SIZE
+        c, r = divmod(len(x), L)
+        y = np.empty_like(x)
+        z0, z1 = z
+
+        if c:
+            chunks = x[:c * L].reshape(c, L)
+            (p00, p01), (p10, p11) = powers[L].tolist()
+            start = np.empty((c, 2))
+            for k, (f0, f1) in enumerate((chunks @ control.T).tolist()):
+                start[k] = z0, z1
+                z0, z1 = p00 * z0 + p01 * z1 + f0, p10 * z0 + p11 * z1 + f1
+            y[:c * L] = (chunks @ toeplitz.T + start @ observe.T).ravel()
+
+        if r:
+            tail = x[c * L:]
+            state = np.array((z0, z1))
+            y[c * L:] = toeplitz[:r, :r] @ tail + observe[:r] @ state
+            z0, z1 = (powers[r] @ state + control[:, L - r:] @ tail).tolist()
+
+        z[0], z[1] = z0, z1
+        return y
+
+
+Stage = Union[Filter, FlankDetector, Callable[[Any], Any]]
+
+
+class Pipeline(Filter):
+    """Chain of filters, edge detectors or any other callable stages, where
+    the output of every stage is the input of the next.
+
+    Consecutive `SMAFilter` and `FIRFilter` stages are fused into a single
+    `FIRFilter`, with the weights of the stages convolved, if their history
+    is in a steady state (e.g. all stages freshly initialized with the same
+    `init`). The fused stages are then no longer updated themselves.
+
+    A `FlankDetector` or `SchmittTrigger` stage outputs the logical level (0
+    or 1) after every sample, using `step` per sample and `levels` for
+    blocks. Undefined values keep the previous level.
+
+    Example::
+
+        p = Pipeline(FIRFilter(w), SMAFilter(8), SchmittTrigger(-1, 1))
+        y = p(x)  # One sample
+        ys = p.process(xs)  # A block of samples
+    """
+    stages: list[Stage]
+    __scratch: tuple[NDArray, NDArray]
+
+    def __init__(self, *stages: Stage, fuse: bool = True):
+        """Init pipeline
+
+        Args:
+            *stages (Filter | FlankDetector | Callable[[Any], Any]): Filters,
+            edge detectors or callables taking one sample, in processing
+            order.
+            fuse (bool, optional): Fuse consecutive linear filters into one.
+            Defaults to True.
+        """
+        self.stages = Pipeline.__fuse(stages) if fuse else list(stages)
+        self.__scratch = (np.empty(0), np.empty(0))
+        self.lock = False
+
+    @staticmethod
+    def __fuse(stages: Sequence[Stage]) -> list[Stage]:
+        fused: list[Stage] = []
+        run: list[tuple[_RingFilter, NDArray]] = []
+
+        for stage in (*stages, None):
+            weights = stage._fir_weights() \
+                if isinstance(stage, _RingFilter) and not stage.lock else None
+            if weights is not None:
+                run.append((stage, weights))
+                continue
+
+            steady, init = len(run) > 1, 0.0
+            if steady:
+                init = expected = float(run[0][0]._window()[0])
+                for filt, w in run:
+                    steady = steady and np.allclose(filt._window(), expected)
+                    expected *= float(np.sum(w))
+            if steady:
+                weights = reduce(np.convolve, (w for _, w in run))
+                fused.append(FIRFilter(weights, init))
+            else:
+                fused.extend(filt for filt, _ in run)
+
+            run = []
+            if stage is not None: fused.append(stage)
+        return fused
+
+    def __call__(self, v: Any) -> Any:
+        """Process the next signal value through all stages.
+
+        Args:
+            v (Any): Newest signal value to be processed.
+
+        Returns:
+            Any: Output of the last stage.
+        """
+        if not self.lock:
+            for stage in self.stages:
+                if isinstance(stage, FlankDetector):
+                    stage.step(v, False)
+                    v = stage._last
+                else:
+                    v = stage(v)
+            self.value = v
         return self.value
+
+    def process(self,
+                block: Union[Sequence[float], NDArray],
+                out: Optional[NDArray] = None) -> NDArray:
+        """Process a block of signal values through all stages. `Filter`
+        stages process the whole block at once and edge detectors find the
+        levels of the whole block at once, each returning a new array.
+        Other stages are called per value, writing into scratch buffers
+        reused between stages and calls, so they must return numbers.
+
+        Args:
+            block (Sequence[float] | NDArray): 1D block of signal values.
+            out (NDArray, optional): Array to write the result into.
+            Defaults to None.
+
+        Returns:
+            NDArray: Output of the last stage for every value in `block`.
+        """
+        block = np.asarray(block)
+        if self.lock or len(block) == 0:
+            return self._locked(block.astype(float), out)
+
+        m = len(block)
+        if len(self.__scratch[0]) < m:
+            self.__scratch = (np.empty(m), np.empty(m))
+
+        data, owned = block, False
+        for i, stage in enumerate(self.stages):
+            if isinstance(stage, Filter):
+                data, owned = stage.process(data), True
+            elif isinstance(stage, FlankDetector):
+                data, owned = stage.levels(data, False), True
+            else:
+                scratch = self.__scratch[i % 2][:m]
+                for k, v in enumerate(data.tolist()):
+                    scratch[k] = stage(v)
+                data, owned = scratch, False
+
+        if out is not None: out[...] = data
+        elif owned: out = data
+        else: out = data.copy()
+        self.value = out[-1]
+        return out
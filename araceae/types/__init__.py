@@ -1,4 +1,7 @@
 from araceae.types.iota import *  # noqa: F401, F403
 from araceae.types.result import *  # noqa: F401, F403
 from araceae.types.vector import *  # noqa: F401, F403
+from araceae.types.slimvec import *  # noqa: F401, F403
 from araceae.types.refchain import *  # noqa: F401, F403
+from araceae.types.spatial import *  # noqa: F401, F403
+from araceae.types.transform import *  # noqa: F401, F403
@@ -0,0 +1,224 @@
+"""
+Pure Python 2D and 3D vectors, with the same API as `Vec2` and `Vec3`.
+
+For vectors this small the overhead of calling NumPy is much larger than
+the arithmetic itself, so these classes store their elements as plain float
+fields in `__slots__` instead of in an ndarray. They are faster and smaller
+for per-vector math, but can not be used as views into `VecArray` batches or
+other buffers. Select them by importing them in place of the NumPy backed
+classes::
+
+    from araceae.types import SlimVec2 as Vec2
+"""
+
+from typing import Iterator, Tuple, Sequence, overload
+from typing_extensions import Self
+from math import sqrt
+
+
+class _SlimVec(Sequence[float]):
+    """Operations shared by the slim vectors, in terms of iteration"""
+    __slots__ = ()
+
+    def euclidean(self) -> float: ...
+
+    def as_int_t(self) -> Tuple[int, ...]:
+        return tuple(map(int, self))
+
+    @overload
+    def __getitem__(self, key: int) -> float: ...
+    @overload
+    def __getitem__(self, key: slice) -> Sequence[float]: ...
+
+    def __getitem__(self, key: int | slice) -> Sequence[float] | float:
+        if isinstance(key, slice):
+            return list(tuple(self)[key])
+        return tuple(self)[key]
+
+    def __lt__(self, other: Self) -> bool:
+        assert len(self) == len(other)
+        return self.euclidean() < other.euclidean()
+
+    def __le__(self, other: Self) -> bool:
+        assert len(self) == len(other)
+        return self.euclidean() <= other.euclidean()
+
+    def __gt__(self, other: Self) -> bool:
+        assert len(self) == len(other)
+        return self.euclidean() > other.euclidean()
+
+    def __ge__(self, other: Self) -> bool:
+        assert len(self) == len(other)
+        return self.euclidean() >= other.euclidean()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            assert len(self) == len(other)
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            assert len(self) == len(other)
+            return tuple(self) != tuple(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __str__(self) -> str:
+        return f'{type(self).__name__}{list(self)}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __contains__(self, key: object) -> bool:
+        return key in tuple(self)
+
+    def __reversed__(self) -> Iterator[float]:
+        return reversed(tuple(self))
+
+
+class SlimVec2(_SlimVec):
+    """A 2x1 vector with `x` and `y` fields, API compatible with `Vec2`"""
+    __slots__ = ('x', 'y')
+    x: float
+    y: float
+
+    def __init__(self, x: float, y: float) -> None:
+        self.x = float(x)
+        self.y = float(y)
+
+    def euclidean(self) -> float:
+        return sqrt(self.x * self.x + self.y * self.y)
+
+    def manhattan(self) -> float:
+        return abs(self.x) + abs(self.y)
+
+    def matmul(self, matrix: Sequence[Sequence[float]]) -> Self:
+        (a, b), (c, d) = matrix
+        return type(self)(self.x * a + self.y * c, self.x * b + self.y * d)
+
+    def __setitem__(self, key: int, newValue: float) -> None:
+        if key == 0 or key == -2: self.x = float(newValue)
+        elif key == 1 or key == -1: self.y = float(newValue)
+        else: raise IndexError
+
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+
+    def __abs__(self) -> Self:
+        return type(self)(abs(self.x), abs(self.y))
+
+    def __add__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 2
+        x, y = other
+        return type(self)(self.x + x, self.y + y)
+
+    def __sub__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 2
+        x, y = other
+        return type(self)(self.x - x, self.y - y)
+
+    def __mul__(self, mul: float) -> Self:
+        return type(self)(self.x * mul, self.y * mul)
+
+    def __iadd__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 2
+        x, y = other
+        self.x += x
+        self.y += y
+        return self
+
+    def __isub__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 2
+        x, y = other
+        self.x -= x
+        self.y -= y
+        return self
+
+    def __imul__(self, mul: float) -> Self:
+        self.x *= mul
+        self.y *= mul
+        return self
+
+
+class SlimVec3(_SlimVec):
+    """A 3x1 vector with `x`, `y` and `z` fields, API compatible with `Vec3`"""
+    __slots__ = ('x', 'y', 'z')
+    x: float
+    y: float
+    z: float
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def euclidean(self) -> float:
+        return sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def manhattan(self) -> float:
+        return abs(self.x) + abs(self.y) + abs(self.z)
+
+    def matmul(self, matrix: Sequence[Sequence[float]]) -> Self:
+        (a, b, c), (d, e, f), (g, h, i) = matrix
+        x, y, z = self.x, self.y, self.z
+        return type(self)(x * a + y * d + z * g,
+                          x * b + y * e + z * h,
+                          x * c + y * f + z * i)
+
+    def __setitem__(self, key: int, newValue: float) -> None:
+        if key == 0 or key == -3: self.x = float(newValue)
+        elif key == 1 or key == -2: self.y = float(newValue)
+        elif key == 2 or key == -1: self.z = float(newValue)
+        else: raise IndexError
+
+    def __len__(self) -> int:
+        return 3
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __abs__(self) -> Self:
+        return type(self)(abs(self.x), abs(self.y), abs(self.z))
+
+    def __add__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 3
+        x, y, z = other
+        return type(self)(self.x + x, self.y + y, self.z + z)
+
+    def __sub__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 3
+        x, y, z = other
+        return type(self)(self.x - x, self.y - y, self.z - z)
+
+    def __mul__(self, mul: float) -> Self:
+        return type(self)(self.x * mul, self.y * mul, self.z * mul)
+
+    def __iadd__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 3
+        x, y, z = other
+        self.x += x
+        self.y += y
+        self.z += z
+        return self
+
+    def __isub__(self, other: Sequence[float]) -> Self:
+        assert len(other) == 3
+        x, y, z = other
+        self.x -= x
+        self.y -= y
+        self.z -= z
+        return self
+
+    def __imul__(self, mul: float) -> Self:
+        self.x *= mul
+        self.y *= mul
+        self.z *= mul
+        return self
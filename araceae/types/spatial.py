@@ -0,0 +1,295 @@
+"""
+Spatial index over 2D or 3D points, for nearest neighbour and radius queries.
+"""
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from math import floor
+from itertools import product
+from functools import lru_cache
+from nptyping import NDArray
+import numpy as np
+
+from araceae.types.vector import (
+    Vec,
+    VecArray,
+    _as_array,
+    _as_points,
+    _check_metric,
+    _distances,
+    _vec_type,
+)
+
+Points = Union[VecArray, NDArray, Sequence[Sequence[float]]]
+
+
+class SpatialGrid:
+    """Uniform grid spatial index of points, supporting k-nearest neighbour
+    and radius queries with euclidean or manhattan distance, and inserting,
+    moving and removing points one at a time.
+
+    Every point gets an integer id when inserted, which stays valid until the
+    point is removed. Queries search the grid cells in rings around the query
+    point until no closer point can remain, so `cell_size` should be in the
+    order of the typical distance between neighbouring points.
+
+    Example::
+
+        grid = SpatialGrid(10, [Vec2(0, 0), Vec2(5, 5), Vec2(50, 50)])
+        ids, dists = grid.nearest(Vec2(4, 4), k=2)  # ids = [1, 0]
+        grid.move(2, Vec2(1, 1))
+    """
+    __cell_size: float
+    __dim: int
+    __points: NDArray
+    __alive: NDArray
+    __free: List[int]
+    __cells: Dict[Tuple[int, ...], Set[int]]
+    __count: int
+    # Bounds of the cell keys ever used, never shrinking on removal
+    __lo: List[int]
+    __hi: List[int]
+
+    def __init__(self,
+                 cell_size: float,
+                 points: Optional[Points] = None,
+                 dim: int = 2):
+        """Init grid
+
+        Args:
+            cell_size (float): Side length of the grid cells.
+            points (VecArray | NDArray | Sequence[Vec], optional): Initial
+            points, getting ids 0 to N-1 in order. Defaults to None.
+            dim (int, optional): Dimension of the points, if not given by
+            `points`. Defaults to 2.
+
+        Raises:
+            ValueError: Invalid cell size.
+        """
+        if cell_size <= 0: raise ValueError('Cell size must be positive.')
+        data = np.empty((0, dim)) if points is None else _as_points(points)
+        if data.ndim != 2: raise ValueError('Points must be (N, dim).')
+
+        self.__cell_size = cell_size
+        self.__dim = data.shape[1]
+        self.__points = np.empty((max(16, len(data)), self.__dim))
+        self.__alive = np.zeros(len(self.__points), dtype=bool)
+        self.__cells = {}
+        self.__points[:len(data)] = data
+        self.__alive[:len(data)] = True
+        self.__count = len(data)
+        keys = self.__keys(data)
+        for i, key in enumerate(keys):
+            self.__cells.setdefault(key, set()).add(i)
+        self.__lo = np.min(keys, axis=0).tolist() if keys else []
+        self.__hi = np.max(keys, axis=0).tolist() if keys else []
+        self.__free = list(range(len(self.__points) - 1, len(data) - 1, -1))
+
+    @property
+    def dim(self) -> int:
+        return self.__dim
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __contains__(self, id: int) -> bool:
+        return 0 <= id < len(self.__alive) and bool(self.__alive[id])
+
+    def __getitem__(self, id: int) -> Vec:
+        """Copy of the point with id `id`"""
+        if id not in self: raise KeyError(id)
+        return _vec_type(self.__dim)._adopt(self.__points[id].copy())
+
+    def ids(self) -> NDArray:
+        """Ids of all points in the grid"""
+        return np.flatnonzero(self.__alive)
+
+    def insert(self, point: Sequence[float]) -> int:
+        """Add a point to the grid.
+
+        Returns:
+            int: Id of the new point.
+        """
+        if not self.__free: self.__grow()
+        id = self.__free.pop()
+        self.__points[id] = _as_array(point)
+        self.__alive[id] = True
+        self.__count += 1
+        self.__link(id, self.__key(self.__points[id]))
+        return id
+
+    def remove(self, id: int) -> None:
+        """Remove the point with id `id` from the grid."""
+        if id not in self: raise KeyError(id)
+        self.__unlink(id)
+        self.__alive[id] = False
+        self.__count -= 1
+        self.__free.append(id)
+
+    def move(self, id: int, point: Sequence[float]) -> None:
+        """Move the point with id `id` to a new position."""
+        if id not in self: raise KeyError(id)
+        key = self.__key(_as_array(point))
+        if key != self.__key(self.__points[id]):
+            self.__unlink(id)
+            self.__link(id, key)
+        self.__points[id] = _as_array(point)
+
+    def nearest(self,
+                point: Sequence[float],
+                k: int = 1,
+                metric: str = 'euclidean') -> Tuple[NDArray, NDArray]:
+        """The `k` points closest to `point`.
+
+        Args:
+            point (Sequence[float]): Query point.
+            k (int, optional): Number of neighbours. Defaults to 1.
+            metric (str, optional): 'euclidean' or 'manhattan'.
+            Defaults to 'euclidean'.
+
+        Returns:
+            Tuple[NDArray, NDArray]: Ids and distances of the (up to) `k`
+            closest points, closest first.
+        """
+        _check_metric(metric)
+        q = _as_array(point)
+        center = self.__key(q)
+        ids: List[int] = []
+        dists = np.empty(0)
+        # Rings closer than the bounds of the used cells are empty
+        ring = max([0, *(a - c for c, a in zip(center, self.__lo)),
+                    *(c - b for c, b in zip(center, self.__hi))])
+        visited = 0
+
+        while True:
+            visited += _ring_size(ring, self.__dim)
+            if visited > len(self.__cells):
+                # More cells would be visited than there are in use, so it
+                # is cheaper to check every point.
+                ids = list(self.ids())
+                dists = self.__distances(q, ids, metric)
+                break
+
+            for offset in _ring(ring, self.__dim):
+                cell = self.__cells.get(
+                    tuple(c + o for c, o in zip(center, offset)))
+                if cell: ids.extend(cell)
+            dists = self.__distances(q, ids, metric)
+
+            # Points outside the searched rings are at least this far away
+            bound = ring * self.__cell_size
+            if len(ids) == self.__count or \
+                    (len(ids) >= k and np.partition(dists, k - 1)[k - 1] <= bound):  # noqa: E501
+                break
+            ring += 1
+
+        order = np.argsort(dists, kind='stable')[:k]
+        return np.array(ids, dtype=int)[order], dists[order]
+
+    def within(self,
+               point: Sequence[float],
+               radius: float,
+               metric: str = 'euclidean') -> Tuple[NDArray, NDArray]:
+        """All points within `radius` of `point`.
+
+        Args:
+            point (Sequence[float]): Query point.
+            radius (float): Maximum distance, inclusive.
+            metric (str, optional): 'euclidean' or 'manhattan'.
+            Defaults to 'euclidean'.
+
+        Returns:
+            Tuple[NDArray, NDArray]: Ids and distances of the points, closest
+            first.
+        """
+        _check_metric(metric)
+        q = _as_array(point)
+        lo = self.__key(q - radius)
+        hi = self.__key(q + radius)
+
+        ids: List[int] = []
+        if np.prod([b - a + 1 for a, b in zip(lo, hi)]) > len(self.__cells):
+            for key, cell in self.__cells.items():
+                if all(a <= c <= b for c, a, b in zip(key, lo, hi)):
+                    ids.extend(cell)
+        else:
+            for key in product(*(range(a, b + 1) for a, b in zip(lo, hi))):
+                cell = self.__cells.get(key)
+                if cell: ids.extend(cell)
+
+        dists = self.__distances(q, ids, metric)
+        order = np.argsort(dists, kind='stable')
+        order = order[dists[order] <= radius]
+        return np.array(ids, dtype=int)[order], dists[order]
+
+    def nearest_bulk(self,
+                     points: Points,
+                     k: int = 1,
+                     metric: str = 'euclidean') -> Tuple[NDArray, NDArray]:
+        """`nearest` for every point in `points`.
+
+        Returns:
+            Tuple[NDArray, NDArray]: Ids and distances, both of shape (N, k).
+            Padded with id -1 and distance inf if the grid has less than `k`
+            points.
+        """
+        queries = _as_points(points)
+        ids = np.full((len(queries), k), -1, dtype=int)
+        dists = np.full((len(queries), k), np.inf)
+        for row, q in enumerate(queries):
+            i, d = self.nearest(q, k, metric)
+            ids[row, :len(i)] = i
+            dists[row, :len(d)] = d
+        return ids, dists
+
+    def within_bulk(self,
+                    points: Points,
+                    radius: float,
+                    metric: str = 'euclidean') -> List[Tuple[NDArray, NDArray]]:  # noqa: E501
+        """`within` for every point in `points`."""
+        return [self.within(q, radius, metric) for q in _as_points(points)]
+
+    def __key(self, p: NDArray) -> Tuple[int, ...]:
+        size = self.__cell_size
+        return tuple(floor(c / size) for c in p.tolist())
+
+    def __keys(self, data: NDArray) -> List[Tuple[int, ...]]:
+        cells = np.floor(data / self.__cell_size).astype(int)
+        return list(map(tuple, cells.tolist()))
+
+    def __link(self, id: int, key: Tuple[int, ...]) -> None:
+        self.__cells.setdefault(key, set()).add(id)
+        if not self.__lo:
+            self.__lo, self.__hi = list(key), list(key)
+            return
+        self.__lo = [min(a, c) for a, c in zip(self.__lo, key)]
+        self.__hi = [max(b, c) for b, c in zip(self.__hi, key)]
+
+    def __unlink(self, id: int) -> None:
+        key = self.__key(self.__points[id])
+        cell = self.__cells[key]
+        cell.discard(id)
+        if not cell: del self.__cells[key]
+
+    def __grow(self) -> None:
+        n = len(self.__points)
+        self.__points = np.concatenate((self.__points, np.empty_like(self.__points)))  # noqa: E501
+        self.__alive = np.concatenate((self.__alive, np.zeros(n, dtype=bool)))
+        self.__free.extend(range(2 * n - 1, n - 1, -1))
+
+    def __distances(self, q: NDArray, ids: List[int], metric: str) -> NDArray:
+        return _distances(self.__points[ids] - q, metric, False)
+
+
+def _ring_size(r: int, dim: int) -> int:
+    return (2 * r + 1)**dim - (2 * r - 1)**dim if r else 1
+
+
+@lru_cache(maxsize=64)
+def _ring(r: int, dim: int) -> List[Tuple[int, ...]]:
+    """Offsets of all cells at Chebyshev distance `r` from the origin"""
+    if r == 0: return [(0,) * dim]
+    # Split the shell by the first axis at distance r, so every offset is
+    # generated once.
+    inner, full = range(-r + 1, r), range(-r, r + 1)
+    return [o for axis in range(dim)
+            for o in product(*[inner] * axis, (-r, r), *[full] * (dim - axis - 1))]  # noqa: E501
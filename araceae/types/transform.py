@@ -0,0 +1,164 @@
+"""
+Affine transforms (rotation, translation, scaling) of 2D and 3D points,
+applied to whole batches of points at once.
+"""
+
+from typing import Optional, Sequence, Union
+from functools import lru_cache
+from math import sin, cos, sqrt
+from nptyping import NDArray
+import numpy as np
+
+from araceae.types.vector import Vec, VecArray, _as_points, rotation_matrix
+
+ROTATION_CACHE_SIZE = 256
+
+
+class Transform:
+    """An affine transform `p' = A p + t` of column vector points, stored as
+    one (dim + 1) x (dim + 1) homogeneous matrix. Transforms are immutable and
+    composed with `@` (right to left, like matrices) or `then` (left to
+    right), so a chain of transforms is applied as a single matrix.
+
+    Example::
+
+        t = Transform.translation(-5, -5).then(Transform.rotation(pi / 2))
+        u = t.apply(points)  # Translate, then rotate, all points at once
+    """
+    __matrix: NDArray
+
+    def __init__(self, matrix: Union[NDArray, Sequence[Sequence[float]]]):
+        """Init transform
+
+        Args:
+            matrix (NDArray): Homogeneous transform matrix, of shape
+            (dim + 1, dim + 1).
+
+        Raises:
+            ValueError: If matrix is not square.
+        """
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] \
+                or len(matrix) < 2:
+            raise ValueError('Transform matrix must be square.')
+        matrix.flags.writeable = False
+        self.__matrix = matrix
+
+    @classmethod
+    def identity(cls, dim: int = 2) -> 'Transform':
+        return cls(np.eye(dim + 1))
+
+    @classmethod
+    def affine(cls,
+               linear: Union[NDArray, Sequence[Sequence[float]]],
+               offset: Optional[Sequence[float]] = None) -> 'Transform':
+        """Transform `p' = linear p + offset`"""
+        linear = np.asarray(linear, dtype=np.float64)
+        m = np.eye(len(linear) + 1)
+        m[:-1, :-1] = linear
+        if offset is not None: m[:-1, -1] = offset
+        return cls(m)
+
+    @classmethod
+    def translation(cls, *offset: float) -> 'Transform':
+        return cls.affine(np.eye(len(offset)), offset)
+
+    @classmethod
+    def scaling(cls, *factors: float) -> 'Transform':
+        return cls.affine(np.diag(factors))
+
+    @classmethod
+    def rotation(cls, rads: float) -> 'Transform':
+        """Counter-clockwise 2D rotation by `rads` radians. Cached by angle,
+        so rotating by the same angles repeatedly does not rebuild them."""
+        return _rotation(rads)
+
+    @classmethod
+    def rotation3(cls, axis: Sequence[float], rads: float) -> 'Transform':
+        """3D rotation by `rads` radians around `axis`, counter-clockwise
+        when looking against the axis. Cached by axis and angle."""
+        return _rotation3(tuple(map(float, axis)), rads)
+
+    @property
+    def matrix(self) -> NDArray:
+        """The (read-only) homogeneous transform matrix"""
+        return self.__matrix
+
+    @property
+    def dim(self) -> int:
+        return len(self.__matrix) - 1
+
+    def inverse(self) -> 'Transform':
+        return Transform(np.linalg.inv(self.__matrix))
+
+    def then(self, other: 'Transform') -> 'Transform':
+        """Transform applying `self` first, then `other`"""
+        return other @ self
+
+    def __matmul__(self, other: 'Transform') -> 'Transform':
+        if not isinstance(other, Transform): return NotImplemented
+        assert self.dim == other.dim
+        return Transform(self.__matrix @ other.__matrix)
+
+    def apply(self,
+              points: Union[Vec, VecArray, NDArray, Sequence[Vec]],
+              out: Union[Vec, VecArray, NDArray, None] = None,
+              ) -> Union[Vec, VecArray, NDArray]:
+        """Transform a point or all points of a batch.
+
+        Args:
+            points (Vec | VecArray | NDArray | Sequence[Vec]): Point, or
+            points of shape (N, dim).
+            out (Vec | VecArray | NDArray, optional): Where to write the
+            result, of the same kind as the returned value. Defaults to None.
+
+        Returns:
+            Vec | VecArray | NDArray: Transformed points, an ndarray for
+            ndarray input, a `VecArray` for batches and sequences.
+        """
+        linear = self.__matrix[:-1, :-1]
+        offset = self.__matrix[:-1, -1]
+
+        if isinstance(points, Vec):
+            r = linear @ points._data if out is None \
+                else np.matmul(linear, points._data, out=out._data)
+            r += offset
+            return type(points)._adopt(r) if out is None else out
+
+        p = _as_points(points)
+        assert p.shape[1] == self.dim
+        dst = out.data if isinstance(out, VecArray) else out
+        r = np.matmul(p, linear.T, out=dst)
+        r += offset
+        if out is not None: return out
+        if isinstance(points, np.ndarray): return r
+        return VecArray(r, copy=False)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Transform):
+            return np.array_equal(self.__matrix, other.__matrix)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __str__(self) -> str:
+        return f'Transform{str(self.__matrix)}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+@lru_cache(maxsize=ROTATION_CACHE_SIZE)
+def _rotation(rads: float) -> Transform:
+    return Transform.affine(rotation_matrix(rads))
+
+
+@lru_cache(maxsize=ROTATION_CACHE_SIZE)
+def _rotation3(axis: tuple[float, float, float], rads: float) -> Transform:
+    # Rodrigues' rotation formula
+    x, y, z = axis
+    n = sqrt(x * x + y * y + z * z)
+    x, y, z = x / n, y / n, z / n
+    c, s = cos(rads), sin(rads)
+    k = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    return Transform.affine(np.eye(3) + s * k + (1 - c) * (k @ k))
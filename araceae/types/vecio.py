@@ -0,0 +1,181 @@
+"""
+Compact binary storage of vectors.
+
+A vector file is a 16 byte header followed by fixed width records, one per
+vector, of `dim` little-endian float64 or float32 elements::
+
+    magic   6 bytes   b'ARAVEC'
+    version uint8     1
+    dtype   char      b'd' (float64) or b'f' (float32)
+    dim     uint32    elements per vector
+    (reserved, 4 zero bytes)
+
+Files can be appended to while being written (`VecWriter`) and loaded as a
+single memory-mapped `VecArray` (`load`), without creating any `Vec` objects.
+"""
+
+from typing import Any, BinaryIO, Optional, Sequence, Union
+from os import PathLike
+import struct
+from nptyping import NDArray
+import numpy as np
+
+from araceae.types.vector import Vec, VecArray, _as_array, _as_points
+
+MAGIC = b'ARAVEC'
+VERSION = 1
+_HEADER = struct.Struct('<6sBcII')
+HEADER_SIZE = _HEADER.size
+_DTYPES = {b'd': np.dtype('<f8'), b'f': np.dtype('<f4')}
+
+Path = Union[str, PathLike]
+Vecs = Union[VecArray, NDArray, Sequence[Sequence[float]]]
+
+
+def _code(dtype: Any) -> bytes:
+    for code, dt in _DTYPES.items():
+        if np.dtype(dtype) == dt.newbyteorder('='): return code
+    raise ValueError(f'Unsupported vector dtype {dtype}, use float64 or float32.')  # noqa: E501
+
+
+def _header(dim: int, dtype: Any) -> bytes:
+    return _HEADER.pack(MAGIC, VERSION, _code(dtype), dim, 0)
+
+
+def _parse_header(data: bytes) -> tuple[int, np.dtype]:
+    """Dimension and record dtype of a vector file header"""
+    if len(data) < HEADER_SIZE: raise ValueError('Not a vector file.')
+    magic, version, code, dim, _ = _HEADER.unpack(data[:HEADER_SIZE])
+    if magic != MAGIC or code not in _DTYPES:
+        raise ValueError('Not a vector file.')
+    if version != VERSION:
+        raise ValueError(f'Unsupported vector file version {version}.')
+    return dim, _DTYPES[code]
+
+
+def dumps(vecs: Union[Vec, Vecs], dtype: Any = np.float64) -> bytes:
+    """Serialize a vector, or a batch or sequence of vectors, to bytes"""
+    data = _as_array(vecs)[None] if isinstance(vecs, Vec) else _as_points(vecs)
+    code = _code(dtype)
+    return _header(data.shape[1], dtype) + \
+        data.astype(_DTYPES[code], copy=False).tobytes()
+
+
+def loads(data: bytes, copy: bool = False) -> VecArray:
+    """Deserialize vectors from `dumps`. Without `copy`, the batch is a
+    read-only view of `data`."""
+    dim, dtype = _parse_header(data)
+    count = (len(data) - HEADER_SIZE) // (dim * dtype.itemsize)
+    batch = VecArray.from_buffer(data, dim, count, HEADER_SIZE, dtype)
+    return VecArray(batch.data) if copy else batch
+
+
+def save(path: Path, vecs: Vecs, dtype: Any = np.float64) -> None:
+    """Write vectors to a new vector file, replacing any existing file"""
+    with open(path, 'wb') as f:
+        f.write(dumps(vecs, dtype))
+
+
+def load(path: Path, mmap: bool = True, writable: bool = False) -> VecArray:
+    """Load all complete records of a vector file as one batch.
+
+    Args:
+        path (str | PathLike): Vector file.
+        mmap (bool, optional): Memory-map the file instead of reading it, so
+        records are only read from disk when accessed. Defaults to True.
+        writable (bool, optional): Map the file writable, writes to the
+        batch then go through to the file. Defaults to False.
+
+    Raises:
+        ValueError: If the file is not a vector file.
+    """
+    with open(path, 'rb') as f:
+        dim, dtype = _parse_header(f.read(HEADER_SIZE))
+        f.seek(0, 2)
+        count = (f.tell() - HEADER_SIZE) // (dim * dtype.itemsize)
+        if not mmap or count == 0:
+            f.seek(HEADER_SIZE)
+            data = np.fromfile(f, dtype, count * dim).reshape(count, dim)
+            return VecArray(data, copy=False)
+
+    data = np.memmap(path, dtype, 'r+' if writable else 'r',
+                     HEADER_SIZE, (count, dim))
+    return VecArray(data, copy=False)
+
+
+class VecWriter:
+    """Streaming writer appending vectors to a vector file.
+
+    Example::
+
+        with VecWriter('track.vec', 2) as w:
+            for p in positions:
+                w.write(p)
+        replay = load('track.vec')  # VecArray of all positions
+    """
+    __file: Optional[BinaryIO] = None
+    __dim: int
+    __dtype: np.dtype
+
+    def __init__(self, path: Path, dim: int, dtype: Any = np.float64):
+        """Open a vector file for appending, creating it if needed.
+
+        Args:
+            path (str | PathLike): Vector file.
+            dim (int): Dimension of the vectors.
+            dtype (Any, optional): Record element type, float64 or float32.
+            Defaults to np.float64.
+
+        Raises:
+            ValueError: If the existing file has another dimension or dtype.
+        """
+        header = _header(dim, dtype)
+        self.__dim = dim
+        self.__dtype = _DTYPES[_code(dtype)]
+        self.__file = f = open(path, 'a+b')
+        try:
+            f.seek(0)
+            existing = f.read(HEADER_SIZE)
+            if not existing:
+                f.write(header)
+            elif _parse_header(existing) != (dim, self.__dtype):
+                raise ValueError('Vector file has a different layout.')
+            else:
+                # Drop a partial record left by an interrupted write
+                size = f.seek(0, 2) - HEADER_SIZE
+                f.truncate(HEADER_SIZE + size
+                           - size % (dim * self.__dtype.itemsize))
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def closed(self) -> bool:
+        return self.__file is None or self.__file.closed
+
+    def write(self, vec: Sequence[float]) -> None:
+        """Append one vector"""
+        v = _as_array(vec)
+        assert self.__file is not None and v.shape == (self.__dim,)
+        self.__file.write(v.astype(self.__dtype, copy=False).tobytes())
+
+    def write_many(self, vecs: Vecs) -> None:
+        """Append a batch or sequence of vectors"""
+        data = _as_points(vecs)
+        assert self.__file is not None and data.shape[1] == self.__dim
+        self.__file.write(data.astype(self.__dtype, copy=False).tobytes())
+
+    def flush(self) -> None:
+        if self.__file is not None: self.__file.flush()
+
+    def close(self) -> None:
+        if self.__file is not None: self.__file.close()
+
+    def __enter__(self) -> 'VecWriter':
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
@@ -1,4 +1,4 @@
-from typing import Iterator, Tuple, Sequence, overload
+from typing import Any, Iterator, Tuple, Sequence, Union, Optional, overload
 from typing_extensions import Self
 from math import sqrt, sin, cos
 from nptyping import NDArray
@@ -17,6 +17,7 @@ class Vec(Sequence[float]):
         x = w.euclidean()  # x = 5.0
 
     """
+    _dim: int = 0
     _size: int
     _data: NDArray
 
@@ -24,6 +25,52 @@ class Vec(Sequence[float]):
         self._size = len(rows)
         self._data = np.array(rows, dtype=np.float64, copy=True)
 
+    @classmethod
+    def _adopt(cls, data: NDArray) -> Self:
+        """Create a vector using `data` as its storage, without copying."""
+        v = cls.__new__(cls)
+        v._size = len(data)
+        v._data = data
+        return v
+
+    @classmethod
+    def view(cls, array: NDArray) -> Self:
+        """Create a vector backed by `array`, e.g. a row or slice of a larger
+        array, without copying. Writes to the vector go through to `array`
+        and the other way around. A read-only array gives a read-only vector.
+
+        Raises:
+            ValueError: If `array` is not a 1D float array, or of the wrong
+            length for `Vec2`/`Vec3`.
+        """
+        if not isinstance(array, np.ndarray) or array.ndim != 1 \
+                or array.dtype.kind != 'f':
+            raise ValueError('Vector view must be of a 1D float array.')
+        if cls._dim and len(array) != cls._dim:
+            raise ValueError(f'{cls.__name__} view must have length {cls._dim}.')  # noqa: E501
+        return cls._adopt(array)
+
+    @classmethod
+    def from_buffer(cls,
+                    buffer: Any,
+                    dim: int = -1,
+                    offset: int = 0,
+                    dtype: Any = np.float64) -> Self:
+        """Create a vector backed by any object supporting the buffer
+        protocol (`bytearray`, `memoryview`, `mmap`, shared memory, ...),
+        without copying. See `view` for write-through semantics.
+
+        Args:
+            buffer (Any): Buffer holding the vector elements.
+            dim (int, optional): Number of elements, the whole buffer if -1.
+            Defaults to the dimension of `Vec2`/`Vec3`, else -1.
+            offset (int, optional): Start of the vector in the buffer, in
+            bytes. Defaults to 0.
+            dtype (Any, optional): Element type. Defaults to np.float64.
+        """
+        if dim == -1 and cls._dim: dim = cls._dim
+        return cls.view(np.frombuffer(buffer, dtype, dim, offset))
+
     def euclidean(self) -> float:
         return sqrt(np.sum(self._data ** 2))
 
@@ -33,11 +80,33 @@ class Vec(Sequence[float]):
     def as_int_t(self) -> Tuple[int, ...]:
         return tuple(map(int, self._data))
 
-    def matmul(self, matrix: NDArray) -> Self:
+    def matmul(self, matrix: NDArray, out: Optional['Vec'] = None) -> Self:
+        """Row vector times `matrix`, written into `out` if given."""
         assert matrix.shape == (self._size, self._size)
-        r = np.matmul(self._data, matrix)
-        assert r.shape == (self._size,)
-        return type(self)(*r)
+        if out is not None:
+            np.matmul(self._data, matrix, out=out._data)
+            return out
+        return type(self)._adopt(np.matmul(self._data, matrix))
+
+    def add(self, other: Sequence[float], out: Optional['Vec'] = None) -> Self:
+        """`self + other`, written into `out` if given."""
+        assert self._size == len(other)
+        if out is None: return self + other
+        np.add(self._data, _as_array(other), out=out._data)
+        return out
+
+    def sub(self, other: Sequence[float], out: Optional['Vec'] = None) -> Self:
+        """`self - other`, written into `out` if given."""
+        assert self._size == len(other)
+        if out is None: return self - other
+        np.subtract(self._data, _as_array(other), out=out._data)
+        return out
+
+    def mul(self, mul: float, out: Optional['Vec'] = None) -> Self:
+        """`self * mul`, written into `out` if given."""
+        if out is None: return self * mul
+        np.multiply(self._data, mul, out=out._data)
+        return out
 
     @overload
     def __getitem__(self, key: int) -> float: ...
@@ -66,27 +135,27 @@ class Vec(Sequence[float]):
         return iter(self._data)
 
     def __abs__(self) -> Self:
-        return type(self)(*map(abs, self._data))
+        return type(self)._adopt(np.abs(self._data))
 
     def __add__(self, other: Sequence[float]):
         assert self._size == len(other)
-        return type(self)(*(self._data + other))
+        return type(self)._adopt(self._data + _as_array(other))
 
     def __sub__(self, other: Sequence[float]) -> Self:
         assert self._size == len(other)
-        return type(self)(*(self._data - other))
+        return type(self)._adopt(self._data - _as_array(other))
 
     def __mul__(self, mul: float) -> Self:
-        return type(self)(*(self._data * mul))
+        return type(self)._adopt(self._data * mul)
 
     def __iadd__(self, other: Sequence[float]) -> Self:
         assert self._size == len(other)
-        self._data += other
+        self._data += _as_array(other)
         return self
 
     def __isub__(self, other: Sequence[float]) -> Self:
         assert self._size == len(other)
-        self._data -= other
+        self._data -= _as_array(other)
         return self
 
     def __imul__(self, mul: float) -> Self:
@@ -136,6 +205,7 @@ class Vec(Sequence[float]):
 
 class Vec2(Vec):
     """A 2x1 Vector, based or `Vec` with `x` and `y` properties"""
+    _dim = 2
 
     def __init__(self, x: float, y: float) -> None:
         super().__init__(x, y)
@@ -149,6 +219,7 @@ class Vec2(Vec):
 
 class Vec3(Vec):
     """A 3x1 Vector, based or `Vec` with `x`, `y` and `y` properties"""
+    _dim = 3
 
     def __init__(self, x: float, y: float, z: float) -> None:
         super().__init__(x, y, z)
@@ -163,6 +234,216 @@ class Vec3(Vec):
     def z(self) -> float: return self._data[2]
 
 
+def _vec_type(dim: int) -> type[Vec]:
+    return Vec2 if dim == 2 else Vec3 if dim == 3 else Vec
+
+
+class VecArray(Sequence[Vec]):
+    """A batch of N vectors of the same dimension, stored as one (N, dim)
+    array, supporting the operations of `Vec` on all vectors at once.
+
+    Indexing with an integer gives a `Vec` (or `Vec2`/`Vec3`) view of that
+    row, and with a slice a `VecArray` view, both sharing memory with the
+    batch.
+
+    Example::
+
+        a = VecArray([(1, 2), (3, 4)])
+        b = a * 2 + Vec2(1, 1)  # b = [[3, 5], [7, 9]]
+        n = b.euclidean()  # n = [5.83..., 11.40...]
+        v = a[1]  # v = Vec2(3, 4), writes to v changes a
+    """
+    _data: NDArray
+
+    def __init__(self,
+                 data: Union[NDArray, Sequence[Sequence[float]]],
+                 copy: bool = True) -> None:
+        """Init batch
+
+        Args:
+            data (NDArray | Sequence[Sequence[float]]): Array of shape
+            (N, dim), or N vectors.
+            copy (bool, optional): Copy `data` even if it is already a float
+            array. Defaults to True.
+
+        Raises:
+            ValueError: If `data` is not of shape (N, dim).
+        """
+        if copy or not isinstance(data, np.ndarray):
+            data = np.array(data, dtype=np.float64)
+        elif data.dtype.kind != 'f':
+            data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2: raise ValueError('Data must be of shape (N, dim).')
+        self._data = data
+
+    @classmethod
+    def from_vecs(cls, vecs: Sequence[Vec], dim: int = 0) -> 'VecArray':
+        """Create a batch from a sequence of vectors, copying them.
+
+        Args:
+            vecs (Sequence[Vec]): Vectors of the same dimension.
+            dim (int, optional): Dimension, only needed if `vecs` is empty.
+            Defaults to 0.
+        """
+        if len(vecs) == 0: return cls(np.empty((0, dim)), copy=False)
+        return cls(np.stack([_as_array(v) for v in vecs]),
+                   copy=False)
+
+    @classmethod
+    def from_buffer(cls,
+                    buffer: Any,
+                    dim: int,
+                    count: int = -1,
+                    offset: int = 0,
+                    dtype: Any = np.float64) -> 'VecArray':
+        """Create a batch backed by any object supporting the buffer
+        protocol, without copying. Writes to the batch, or vectors indexed
+        from it, go through to `buffer`. A read-only buffer gives a read-only
+        batch.
+
+        Args:
+            buffer (Any): Buffer holding `count * dim` elements, row by row.
+            dim (int): Dimension of the vectors.
+            count (int, optional): Number of vectors, as many as fit in the
+            buffer if -1. Defaults to -1.
+            offset (int, optional): Start of the first vector in the buffer,
+            in bytes. Defaults to 0.
+            dtype (Any, optional): Element type. Defaults to np.float64.
+        """
+        n = count * dim if count >= 0 else -1
+        data = np.frombuffer(buffer, dtype, n, offset)
+        return cls(data.reshape(-1, dim), copy=False)
+
+    def to_vecs(self) -> list[Vec]:
+        """Copy the batch to a list of independent vectors."""
+        t = _vec_type(self.dim)
+        return [t._adopt(row) for row in self._data.copy()]
+
+    @property
+    def data(self) -> NDArray:
+        """The underlying (N, dim) array."""
+        return self._data
+
+    @property
+    def dim(self) -> int:
+        return self._data.shape[1]
+
+    def euclidean(self, other: Optional[Sequence[float]] = None) -> NDArray:
+        """Euclidean norm of every vector, or distance to `other`, which is a
+        single point or a batch of the same length."""
+        d = self._data if other is None else self._data - _as_array(other)
+        return np.sqrt(np.einsum('ij,ij->i', d, d))
+
+    def manhattan(self, other: Optional[Sequence[float]] = None) -> NDArray:
+        """Manhattan norm of every vector, or distance to `other`, which is a
+        single point or a batch of the same length."""
+        d = self._data if other is None else self._data - _as_array(other)
+        return np.sum(np.abs(d), axis=1)
+
+    def as_int_t(self) -> NDArray:
+        """All vectors as an (N, dim) int array, truncated like `int()`"""
+        return self._data.astype(int)
+
+    def matmul(self, matrix: NDArray) -> 'VecArray':
+        """Multiply every vector with `matrix`, same as `Vec.matmul`"""
+        assert matrix.shape == (self.dim, self.dim)
+        return VecArray(self._data @ matrix, copy=False)
+
+    @overload
+    def __getitem__(self, key: int) -> Vec: ...
+    @overload
+    def __getitem__(self, key: slice) -> 'VecArray': ...
+
+    def __getitem__(self, key: int | slice) -> Union[Vec, 'VecArray']:
+        if isinstance(key, slice):
+            return VecArray(self._data[key], copy=False)
+        return _vec_type(self.dim)._adopt(self._data[key])
+
+    def __setitem__(self, key: int | slice, value: Sequence[float]) -> None:
+        self._data[key] = _as_array(value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[Vec]:
+        t = _vec_type(self.dim)
+        return (t._adopt(row) for row in self._data)
+
+    def __abs__(self) -> 'VecArray':
+        return VecArray(np.abs(self._data), copy=False)
+
+    def __add__(self, other: Sequence[float]) -> 'VecArray':
+        return VecArray(self._data + _as_array(other), copy=False)
+
+    def __sub__(self, other: Sequence[float]) -> 'VecArray':
+        return VecArray(self._data - _as_array(other), copy=False)
+
+    def __mul__(self, mul: float) -> 'VecArray':
+        return VecArray(self._data * mul, copy=False)
+
+    def __iadd__(self, other: Sequence[float]) -> Self:
+        self._data += _as_array(other)
+        return self
+
+    def __isub__(self, other: Sequence[float]) -> Self:
+        self._data -= _as_array(other)
+        return self
+
+    def __imul__(self, mul: float) -> Self:
+        self._data *= mul
+        return self
+
+    def __lt__(self, other: Sequence[float]) -> NDArray:
+        return self.euclidean() < _norms(other)
+
+    def __le__(self, other: Sequence[float]) -> NDArray:
+        return self.euclidean() <= _norms(other)
+
+    def __gt__(self, other: Sequence[float]) -> NDArray:
+        return self.euclidean() > _norms(other)
+
+    def __ge__(self, other: Sequence[float]) -> NDArray:
+        return self.euclidean() >= _norms(other)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (VecArray, Sequence, np.ndarray)):
+            return np.array_equal(self._data, _as_array(other))
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        if isinstance(other, (VecArray, Sequence, np.ndarray)):
+            return not np.array_equal(self._data, _as_array(other))
+        return NotImplemented
+
+    def __str__(self) -> str:
+        return f'VecArray{str(self._data)}'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _as_array(v: Union[Vec, VecArray, Sequence[float], NDArray]) -> NDArray:
+    """View a vector, batch or sequence as an array, without copying vectors
+    and batches."""
+    if isinstance(v, (Vec, VecArray)): return v._data
+    return np.asarray(v, dtype=np.float64)
+
+
+def _as_points(points: Union[VecArray, NDArray, Sequence[Sequence[float]]]
+               ) -> NDArray:
+    """View a batch or array of points as an (N, dim) array, copying only
+    sequences of vectors."""
+    if isinstance(points, VecArray): return points._data
+    if isinstance(points, np.ndarray): return points.astype(np.float64, copy=False)  # noqa: E501
+    return np.array([_as_array(p) for p in points], dtype=np.float64)
+
+
+def _norms(v: Union[Vec, VecArray, Sequence[float], NDArray]) -> NDArray:
+    """Euclidean norm of a vector, or of every vector in a batch"""
+    a = _as_array(v)
+    return np.sqrt(np.sum(a ** 2, axis=-1))
+
+
 def euclidean(a: Vec, b: 'Vec') -> float:
     "Euclidean distance between two points"
     return sqrt(sum(map(lambda ab: (ab[0] - ab[1])**2, zip(a, b))))
@@ -173,6 +454,90 @@ def manhattan(a: Vec, b: 'Vec') -> float:
     return sum(map(lambda ab: abs(ab[0] - ab[1]), zip(a, b)))
 
 
+_METRICS = ('euclidean', 'manhattan')
+
+
+def _check_metric(metric: str) -> None:
+    if metric not in _METRICS:
+        raise ValueError(f'Unknown metric {metric}, must be one of {_METRICS}.')  # noqa: E501
+
+
+def _distances(d: NDArray, metric: str, squared: bool) -> NDArray:
+    """Distances from differences `d`, over the last axis"""
+    if metric == 'manhattan': return np.sum(np.abs(d), axis=-1)
+    r = np.einsum('...i,...i->...', d, d)
+    return r if squared else np.sqrt(r, out=r)
+
+
+def pairwise_distances(a: Union[VecArray, NDArray, Sequence[Sequence[float]]],
+                       b: Union[VecArray, NDArray, Sequence[Sequence[float]], None] = None,  # noqa: E501
+                       metric: str = 'euclidean',
+                       squared: bool = False,
+                       chunk_size: int = 1 << 20) -> NDArray:
+    """Distance between every point in `a` and every point in `b`.
+
+    Args:
+        a (VecArray | NDArray | Sequence[Vec]): N points.
+        b (VecArray | NDArray | Sequence[Vec], optional): M points.
+        Defaults to `a`.
+        metric (str, optional): 'euclidean' or 'manhattan'.
+        Defaults to 'euclidean'.
+        squared (bool, optional): Return squared euclidean distances, which
+        have the same ordering but skip the square root. Defaults to False.
+        chunk_size (int, optional): Maximum number of coordinate differences
+        computed at once, rows of `a` are processed in chunks to stay below
+        it. Defaults to 2**20.
+
+    Raises:
+        ValueError: Unknown metric or squared manhattan distances.
+
+    Returns:
+        NDArray: Distances of shape (N, M).
+    """
+    _check_metric(metric)
+    if squared and metric != 'euclidean':
+        raise ValueError('Only euclidean distances can be squared.')
+    pa = _as_points(a)
+    pb = pa if b is None else _as_points(b)
+    assert pa.shape[1] == pb.shape[1]
+
+    r = np.empty((len(pa), len(pb)))
+    rows = max(1, chunk_size // max(1, pb.size))
+    for i in range(0, len(pa), rows):
+        d = pa[i:i + rows, None, :] - pb[None, :, :]
+        r[i:i + rows] = _distances(d, metric, squared)
+    return r
+
+
+def paired_distances(a: Union[VecArray, NDArray, Sequence[Sequence[float]]],
+                     b: Union[VecArray, NDArray, Sequence[Sequence[float]]],
+                     metric: str = 'euclidean',
+                     squared: bool = False) -> NDArray:
+    """Distance between every point in `a` and the point at the same index
+    in `b`.
+
+    Args:
+        a (VecArray | NDArray | Sequence[Vec]): N points.
+        b (VecArray | NDArray | Sequence[Vec]): N points.
+        metric (str, optional): 'euclidean' or 'manhattan'.
+        Defaults to 'euclidean'.
+        squared (bool, optional): Return squared euclidean distances.
+        Defaults to False.
+
+    Raises:
+        ValueError: Unknown metric or squared manhattan distances.
+
+    Returns:
+        NDArray: Distances of shape (N,).
+    """
+    _check_metric(metric)
+    if squared and metric != 'euclidean':
+        raise ValueError('Only euclidean distances can be squared.')
+    pa, pb = _as_points(a), _as_points(b)
+    assert pa.shape == pb.shape
+    return _distances(pa - pb, metric, squared)
+
+
 def rotation_matrix(rads: float) -> NDArray:
     return np.array([[cos(rads), -sin(rads)],
                      [sin(rads), cos(rads)]], dtype=float)
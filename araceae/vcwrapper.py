@@ -2,13 +2,25 @@
 A simple wrapper  class providing a common interface for
 reading image frames from different video sources.
 - `vcfile`: Video file (`cv2.VideoCapture`)
+- `vcparallel`: Video file decoded by several processes
+- `vcasync`: asyncio adapter over any of the above
 - `vccamera`: Raspberry pi camera (`Picamera2`)
 """
 
+import asyncio
 import cv2
-from numpy import zeros, uint8
+import multiprocessing as mp
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+from numpy import zeros, uint8, empty, copyto, ndarray
 from nptyping import NDArray
-from typing import Protocol, Iterable, Iterator, Any
+from typing import (
+    Protocol, Iterable, Iterator, AsyncIterator, Any, Optional, Tuple, List,
+    Dict, Set)
+from threading import Thread, Event
+from queue import Queue, Full, Empty
+from collections import deque
 
 
 class LastFrameException(Exception):
@@ -26,6 +38,12 @@ class vccommon(Iterable, Protocol):
         When frames are exhausted, a LatFrameException will be raised."""
         ...
 
+    def read_into(self, out: NDArray) -> NDArray:
+        """Read one frame from the video source into `out`, which must have
+        the shape and dtype of the frames, and return it.
+        When frames are exhausted, a LatFrameException will be raised."""
+        ...
+
     def vc_object(self) -> Any:
         """Get the underlying video capture object."""
         ...
@@ -35,33 +53,233 @@ class vccommon(Iterable, Protocol):
     def __next__(self) -> NDArray: ...
 
 
-class vcfile(vccommon):
-    def __init__(self, file: str):
+class FramePool:
+    """Pool of preallocated frame buffers, recycled when released.
+    If every buffer is in use a new one is allocated, but at most `size`
+    buffers are kept for reuse."""
+
+    def __init__(self, shape: Tuple[int, ...], dtype: Any, size: int):
+        self.shape = shape
+        self.dtype = dtype
+        self.size = size
+        self.__free: deque = deque(empty(shape, dtype) for _ in range(size))
+
+    def acquire(self) -> 'PooledFrame':
+        """Take a buffer from the pool."""
+        try:
+            buffer = self.__free.pop()
+        except IndexError:
+            buffer = empty(self.shape, self.dtype)
+        return PooledFrame(self, buffer)
+
+    def _release(self, buffer: NDArray) -> None:
+        if len(self.__free) < self.size: self.__free.append(buffer)
+
+
+class PooledFrame:
+    """Frame buffer borrowed from a `FramePool`. The buffer is returned to
+    the pool by `release`, or when leaving the context, and must not be used
+    after that.
+
+    Example::
+
+        with vc.read_pooled() as im:
+            process(im)
+    """
+
+    def __init__(self, pool: FramePool, array: NDArray):
+        self.array = array
+        self.__pool: Optional[FramePool] = pool
+
+    def release(self) -> None:
+        """Return the buffer to the pool, if not already returned."""
+        if self.__pool is not None:
+            self.__pool._release(self.array)
+            self.__pool = None
+
+    def __enter__(self) -> NDArray:
+        return self.array
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.release()
+
+
+class _vcpool:
+    """Pooled reading for sources implementing `read` and `read_into`"""
+    _pool: Optional[FramePool] = None
+    _pool_size: int = 4
+
+    def read(self) -> NDArray: ...
+    def read_into(self, out: NDArray) -> NDArray: ...
+
+    def read_pooled(self) -> PooledFrame:
+        """Read one frame into a recycled buffer from the sources frame
+        pool, created with the shape of the first frame. Release the frame
+        when done with it, to return the buffer to the pool.
+        When frames are exhausted, a LastFrameException will be raised."""
+        if self._pool is None:
+            im = self.read()
+            self._pool = FramePool(im.shape, im.dtype, self._pool_size)
+            frame = self._pool.acquire()
+            copyto(frame.array, im)
+            return frame
+
+        frame = self._pool.acquire()
+        try:
+            self.read_into(frame.array)
+        except BaseException:
+            frame.release()
+            raise
+        return frame
+
+
+class _vcbatch:
+    """Batched reading for sources implementing `read` and `read_into`"""
+
+    def read(self) -> NDArray: ...
+    def read_into(self, out: NDArray) -> NDArray: ...
+
+    def read_batch(self, n: int, out: Optional[NDArray] = None) -> NDArray:
+        """Read up to `n` frames into one contiguous (n, H, W, C) array.
+        Frames are decoded directly into `out` when given, else into a new
+        array shaped after the first frame. The batch is shorter than `n`
+        when the source runs out of frames.
+        When frames are exhausted, a LastFrameException will be raised."""
+        if n < 1: raise ValueError('Batch size must be at least 1.')
+        if out is not None and len(out) < n:
+            raise ValueError(f'Batch of {n} frames does not fit in {len(out)}')
+        if out is None:
+            im = self.read()
+            out = empty((n, *im.shape), dtype=im.dtype)
+            copyto(out[0], im)
+            start = 1
+        else:
+            start = 0
+
+        for i in range(start, n):
+            try:
+                self.read_into(out[i])
+            except LastFrameException:
+                if i == 0: raise
+                return out[:i]
+        return out[:n]
+
+    def batches(self, n: int,
+                out: Optional[NDArray] = None) -> Iterator[NDArray]:
+        """Iterate over batches of `n` frames, as read by `read_batch`.
+        With `out`, every batch reuses that array."""
+        while True:
+            try:
+                yield self.read_batch(n, out)
+            except LastFrameException:
+                return
+
+
+def _prefetch(vc: cv2.VideoCapture, queue: Queue, stop: Event) -> None:
+    """Decode frames from `vc` into `queue` until exhausted or stopped,
+    ending with None, or with the exception raised by reading."""
+    end: Optional[Exception] = None
+    try:
+        while not stop.is_set():
+            ret, im = vc.read()
+            if not ret: break
+            _put(queue, im, stop)
+    except Exception as e:
+        end = e
+    finally:
+        _put(queue, end, stop)
+
+
+def _put(queue: Queue, item: Any, stop: Event) -> None:
+    """Put `item` in `queue`, waiting for space until stopped."""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return
+        except Full:
+            continue
+
+
+class vcfile(_vcpool, _vcbatch, vccommon):
+    """Video file source. With `prefetch`, frames are decoded ahead on a
+    background thread, so decoding overlaps with processing the frames.
+    The video capture object must then not be read from directly.
+    `read_pooled` decodes into recycled buffers from a pool of `pool`
+    frames."""
+    __queue: Optional[Queue] = None
+    __thread: Optional[Thread] = None
+    __done: bool = False
+
+    def __init__(self, file: str, prefetch: int = 0, pool: int = 4):
+        """Open video file.
+
+        Args:
+            file (str): Path of the video file.
+            prefetch (int, optional): Number of frames to decode ahead on a
+            background thread, 0 to decode when read. Defaults to 0.
+            pool (int, optional): Number of buffers kept for reuse by
+            `read_pooled`. Defaults to 4.
+        """
         self.__vc = cv2.VideoCapture(file)
+        self._pool_size = pool
+        if prefetch > 0:
+            self.__queue = Queue(maxsize=prefetch)
+            self.__stop = Event()
+            # The thread must not reference self, so __del__ can run while
+            # it is waiting for space in the queue.
+            self.__thread = Thread(target=_prefetch,
+                                   args=(self.__vc, self.__queue, self.__stop),
+                                   daemon=True)
+            self.__thread.start()
+
+    def __grab(self) -> Optional[NDArray]:
+        """Next frame, or None when frames are exhausted. Exceptions raised
+        while prefetching are raised here."""
+        if self.__queue is None:
+            ret, im = self.__vc.read()
+            return im if ret else None
+        if self.__done: return None
+        im = self.__queue.get()
+        if im is None or isinstance(im, Exception): self.__done = True
+        if isinstance(im, Exception): raise im
+        return im
 
     def read(self) -> NDArray:
-        ret, im = self.__vc.read()
-        if not ret:
+        im = self.__grab()
+        if im is None:
             raise LastFrameException('Could not read')
         return im
 
+    def read_into(self, out: NDArray) -> NDArray:
+        if self.__queue is not None:
+            copyto(out, self.read())
+            return out
+        ret, im = self.__vc.read(out)
+        if not ret:
+            raise LastFrameException('Could not read')
+        if im is not out: copyto(out, im)
+        return out
+
     def vc_object(self) -> cv2.VideoCapture:
         return self.__vc
 
     def __del__(self) -> None:
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
         self.__vc.release()
 
     def __iter__(self) -> Iterator[NDArray]:
         return self
 
     def __next__(self) -> NDArray:
-        ret, im = self.__vc.read()
-        if not ret:
+        im = self.__grab()
+        if im is None:
             raise StopIteration
         return im
 
 
-class vcnull(vccommon):
+class vcnull(_vcbatch, vccommon):
     def __init__(self, height: int, width: int, length: int = -1):
         self.__frame = zeros((height, width), dtype=uint8)
         self.__len = length
@@ -72,6 +290,10 @@ class vcnull(vccommon):
         self.__len -= 1
         return self.__frame
 
+    def read_into(self, out: NDArray) -> NDArray:
+        copyto(out, self.read())
+        return out
+
     def vc_object(self) -> NDArray:
         return self.__frame
 
@@ -87,18 +309,369 @@ class vcnull(vccommon):
         return self.__frame
 
 
+def _decode(file: str, shm: str, shape: Tuple[int, ...],
+            chunks: List[Tuple[int, Optional[int]]], free: Any, done: Any,
+            worker: int) -> None:
+    """Decode the frame ranges `chunks` of `file` into the slots of the
+    shared memory block `shm`, a range without end until reading fails.
+    A free slot is taken from `free` for every frame, and
+    `(worker, slot, index)` put on `done`, ending with `(worker, -1, None)`
+    or `(worker, -1, exception)` if decoding raised one."""
+    memory = SharedMemory(shm)
+    slots = ndarray(shape, dtype=uint8, buffer=memory.buf)
+    vc = cv2.VideoCapture(file)
+    end: Optional[Exception] = None
+    try:
+        for start, stop in chunks:
+            if vc.get(cv2.CAP_PROP_POS_FRAMES) != start:
+                vc.set(cv2.CAP_PROP_POS_FRAMES, start)
+            index = start
+            while stop is None or index < stop:
+                slot = free.get()
+                ret, im = vc.read(slots[slot])
+                if not ret: return
+                if im is not slots[slot]: copyto(slots[slot], im)
+                done.put((worker, slot, index))
+                index += 1
+    except Exception as e:
+        end = e
+    finally:
+        done.put((worker, -1, end))
+        vc.release()
+        del slots
+        memory.close()
+
+
+class vcparallel(_vcpool, _vcbatch, vccommon):
+    """Video file source decoded in parallel by `workers` processes.
+    The file is split into ranges of `chunk` frames, dealt out round robin
+    to the workers, which seek to each range and decode it. Frames are
+    passed back through shared memory, with `slots` buffers per worker.
+    Seeking can cost as much as decoding several frames, so chunks should
+    not be too small.
+
+    The frame count reported by the file is only used to split it, the last
+    range is read until decoding fails, so no frames are lost when the
+    count is an underestimate.
+
+    Frames are delivered in order, or as soon as they are decoded with
+    `ordered=False`. `read_indexed` and `indexed` also give the index of
+    each frame, which is needed to place unordered frames. Exceptions raised
+    by a worker are raised by the read that reaches them, and a worker that
+    dies raises a RuntimeError instead of blocking the reader.
+
+    By default the slots of all workers together take up to
+    `SHARED_MEMORY` bytes, but at least 2 slots per worker. In ordered mode
+    a worker can only decode as many frames ahead of the reader as it has
+    slots, so throughput scales with the number of workers when `slots`
+    approaches `chunk`. Raise `slots` for throughput if enough shared
+    memory (`/dev/shm`) is available, e.g. 64 frames are about 400 MB per
+    worker at 1080p."""
+    POLL_INTERVAL = 0.5
+    SHARED_MEMORY = 32 << 20
+    __done: bool = False
+    __memory: Optional[Dict[int, SharedMemory]] = None
+    __workers: Optional[List[Any]] = None
+
+    def __init__(self, file: str, workers: Optional[int] = None,
+                 ordered: bool = True, chunk: Optional[int] = None,
+                 slots: Optional[int] = None, pool: int = 4):
+        """Open video file and start decoding.
+
+        Args:
+            file (str): Path of the video file.
+            workers (int, optional): Number of decoding processes.
+            Defaults to the number of CPUs.
+            ordered (bool, optional): Deliver frames in order.
+            Defaults to True.
+            chunk (int, optional): Frames decoded by a worker between
+            seeks. Defaults to 64 when ordered, else one range per worker.
+            slots (int, optional): Frames buffered per worker, ideally
+            `chunk` to keep all workers busy in ordered mode. Defaults to
+            fitting all slots in `SHARED_MEMORY`, between 2 and `chunk`.
+            pool (int, optional): Number of buffers kept for reuse by
+            `read_pooled`. Defaults to 4.
+        """
+        vc = cv2.VideoCapture(file)
+        count = int(vc.get(cv2.CAP_PROP_FRAME_COUNT))
+        height = int(vc.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        width = int(vc.get(cv2.CAP_PROP_FRAME_WIDTH))
+        vc.release()
+
+        workers = max(1, min(workers or mp.cpu_count(), count))
+        if chunk is None:
+            chunk = 64 if ordered else max(1, -(-count // workers))
+        ranges = max(1, -(-count // chunk))
+        workers = min(workers, ranges)
+        frame = height * width * 3
+        if not slots:
+            fit = self.SHARED_MEMORY // max(1, workers * frame)
+            slots = max(2, min(chunk, fit))
+        self._pool_size = pool
+        self.__file = file
+        self.__ordered = ordered
+        self.__chunk = chunk
+        self.__last = ranges - 1
+        self.__next = 0
+        self.__ended: Set[int] = set()
+        self.__shape = (slots, height, width, 3)
+        self.__memory = {}
+        self.__slots: Dict[int, ndarray] = {}
+        self.__free = [mp.Queue() for _ in range(workers)]
+        self.__queues = [mp.Queue() for _ in range(workers)] if ordered \
+            else [mp.Queue()] * workers
+        self.__workers = []
+
+        size = slots * frame
+        for w in range(workers):
+            memory = SharedMemory(create=True, size=max(size, 1))
+            self.__memory[w] = memory
+            self.__slots[w] = ndarray(self.__shape, dtype=uint8,
+                                      buffer=memory.buf)
+            for slot in range(slots): self.__free[w].put(slot)
+            chunks: List[Tuple[int, Optional[int]]] = [
+                (k * chunk, None if k == ranges - 1 else (k + 1) * chunk)
+                for k in range(w, ranges, workers)]
+            process = mp.Process(target=_decode, daemon=True, args=(
+                file, memory.name, self.__shape, chunks,
+                self.__free[w], self.__queues[w], w))
+            process.start()
+            self.__workers.append(process)
+
+    def __grab(self, out: Optional[ndarray] = None
+               ) -> Optional[Tuple[int, ndarray]]:
+        """Index and frame of the next frame copied into `out` or a new
+        array, or None when frames are exhausted"""
+        while not self.__done:
+            if self.__ordered:
+                k = min(self.__next // self.__chunk, self.__last)
+                w = k % len(self.__free)
+            else:
+                w = 0
+            worker, slot, message = self.__get(w)
+            if slot < 0:
+                self.__ended.add(worker)
+                self.__done = self.__ordered or \
+                    len(self.__ended) == len(self.__free)
+                if message is not None:
+                    self.__done = True
+                    raise message
+                continue
+            index = message
+
+            im = self.__slots[worker][slot]
+            if out is None: out = im.copy()
+            else: copyto(out, im)
+            self.__free[worker].put(slot)
+            self.__next = index + 1
+            return index, out
+        return None
+
+    def __get(self, w: int) -> Tuple[int, int, Any]:
+        """Next message from the queue of worker `w`, checking that the
+        workers that may still send to it are alive while waiting."""
+        queue = self.__queues[w]
+        while True:
+            try:
+                return queue.get(timeout=self.POLL_INTERVAL)
+            except Empty:
+                pass
+            workers = [w] if self.__ordered else \
+                [i for i in range(len(self.__free)) if i not in self.__ended]
+            for i in workers:
+                process = self.__workers[i] if self.__workers else None
+                if process is not None and not process.is_alive():
+                    # Messages sent right before exiting may arrive late
+                    try:
+                        return queue.get(timeout=self.POLL_INTERVAL)
+                    except Empty:
+                        self.__done = True
+                        raise RuntimeError(
+                            f'Decoding worker {i} exited with code '
+                            f'{process.exitcode}.')
+
+    def read_indexed(self) -> Tuple[int, NDArray]:
+        """Read one frame and its index in the file.
+        When frames are exhausted, a LastFrameException will be raised."""
+        frame = self.__grab()
+        if frame is None:
+            raise LastFrameException('Could not read')
+        return frame
+
+    def indexed(self) -> Iterator[Tuple[int, NDArray]]:
+        """Iterate over frames and their indices in the file."""
+        while (frame := self.__grab()) is not None:
+            yield frame
+
+    def read(self) -> NDArray:
+        return self.read_indexed()[1]
+
+    def read_into(self, out: NDArray) -> NDArray:
+        if self.__grab(out) is None:
+            raise LastFrameException('Could not read')
+        return out
+
+    def vc_object(self) -> str:
+        return self.__file
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        self.__done = True
+        if self.__workers is not None:
+            for process in self.__workers:
+                process.terminate()
+                process.join()
+            self.__workers = None
+        self.__slots = {}
+        if self.__memory is not None:
+            for memory in self.__memory.values():
+                memory.close()
+                memory.unlink()
+            self.__memory = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[NDArray]:
+        return self
+
+    def __next__(self) -> NDArray:
+        frame = self.__grab()
+        if frame is None:
+            raise StopIteration
+        return frame[1]
+
+
+@lru_cache(maxsize=None)
+def _executor() -> Executor:
+    """Executor shared by every `vcasync` source without its own"""
+    return ThreadPoolExecutor(thread_name_prefix='vcasync')
+
+
+class vcasync(AsyncIterator[NDArray]):
+    """asyncio adapter over a `vccommon` source. Frames are decoded by
+    blocking reads on an executor, shared by all sources unless one is
+    given, so the event loop is never blocked and no thread is tied to a
+    source. A task reads up to `readahead` frames ahead, one at a time.
+
+    Example::
+
+        async with vcasync(vcfile(path)) as vc:
+            async for im in vc:
+                await process(im)
+    """
+    __task: Optional[asyncio.Task] = None
+
+    def __init__(self, source: vccommon, readahead: int = 2,
+                 executor: Optional[Executor] = None):
+        """Wrap source.
+
+        Args:
+            source (vccommon): Video source, which must not be read from
+            directly while wrapped.
+            readahead (int, optional): Number of frames read ahead of the
+            consumer, 0 to read when awaited. Defaults to 2.
+            executor (Executor, optional): Executor for the blocking reads.
+            Defaults to a thread pool shared by all sources.
+        """
+        self.__source = source
+        self.__readahead = readahead
+        self.__executor = executor
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__pending: Optional[asyncio.Future] = None
+        self.__done = False
+
+    def __read(self) -> 'asyncio.Future[NDArray]':
+        return asyncio.get_running_loop().run_in_executor(
+            self.__executor or _executor(), self.__source.read)
+
+    async def __pump(self, queue: asyncio.Queue) -> None:
+        """Read frames into `queue`, ending with the exception that
+        stopped reading."""
+        while True:
+            try:
+                item = await self.__read()
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(item)
+
+    async def read(self) -> NDArray:
+        """Read one frame from the source.
+        When frames are exhausted, a LastFrameException will be raised."""
+        if self.__done:
+            raise LastFrameException('Could not read')
+        if self.__readahead <= 0:
+            # A cancelled read keeps running on the executor, so it is
+            # shielded and its frame returned by the next read instead of
+            # reading the source concurrently.
+            if self.__pending is None: self.__pending = self.__read()
+            try:
+                return await asyncio.shield(self.__pending)
+            except LastFrameException:
+                self.__done = True
+                raise
+            finally:
+                if self.__pending.done(): self.__pending = None
+
+        if self.__queue is None:
+            self.__queue = asyncio.Queue(maxsize=self.__readahead)
+            self.__task = asyncio.create_task(self.__pump(self.__queue))
+        item = await self.__queue.get()
+        if isinstance(item, Exception):
+            self.__done = True
+            raise item
+        return item
+
+    def vc_object(self) -> vccommon:
+        return self.__source
+
+    async def aclose(self) -> None:
+        """Stop reading ahead. A read already running on the executor
+        finishes, but its frame is dropped."""
+        self.__done = True
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    async def __aenter__(self) -> 'vcasync':
+        return self
+
+    async def __aexit__(self, type, value, traceback) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> 'vcasync':
+        return self
+
+    async def __anext__(self) -> NDArray:
+        try:
+            return await self.read()
+        except LastFrameException:
+            raise StopAsyncIteration
+
+
 try:
     from picamera2 import Picamera2  # type: ignore
 
-    class vccamera():  # type: ignore
-        def __init__(self):
+    class vccamera(_vcpool, _vcbatch):  # type: ignore
+        def __init__(self, pool: int = 4):
             self.__cam = Picamera2()
             self.__cam.start()
+            self._pool_size = pool
 
         def read(self) -> NDArray:
             im = self.__cam.capture_array()
             return cv2.cvtColor(im, cv2.COLOR_RGB2BGR)
 
+        def read_into(self, out: NDArray) -> NDArray:
+            im = self.__cam.capture_array()
+            cv2.cvtColor(im, cv2.COLOR_RGB2BGR, dst=out)
+            return out
+
         def __del__(self) -> None:
             self.__cam.close()
 
@@ -113,7 +686,7 @@ try:
 
 except ImportError:
     class vccamera():  # type: ignore
-        def __init__(self):
+        def __init__(self, pool: int = 4):
             raise NotImplementedError(
                 'Pi camera not available. '
                 + 'Check your platform or systems packages.')
@@ -0,0 +1,294 @@
+"""
+Benchmarks for the hot classes in `araceae.signal`, `araceae.calculus` and
+`araceae.types`.
+
+Every benchmark measures either the time per call (`ns_per_call`) when
+processing one sample at a time, the throughput (`samples_per_s`) of the
+block processing methods, or the memory used per object (`bytes_per_object`).
+
+Usage::
+
+    python benchmarks/bench.py run -o results.json
+    python benchmarks/bench.py compare old.json new.json --threshold 0.1
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import json
+import platform
+import sys
+import tracemalloc
+
+import numpy as np
+
+from araceae.calculus import Integrator, Derivator
+from araceae.signal import (
+    FlankDetector,
+    SchmittTrigger,
+    SMAFilter,
+    FIRFilter,
+    IIRFilter,
+    MedianFilter,
+    SMAFilterBank,
+    FIRFilterBank,
+)
+from araceae.types import Vec2, Vec3, SlimVec2, SlimVec3
+
+SIZES = (8, 64, 256)
+DTYPES = ('float64', 'float32')
+SAMPLES = 2000
+BLOCK = 1 << 17
+CHANNELS = 64
+
+PER_CALL = 'ns_per_call'
+THROUGHPUT = 'samples_per_s'
+MEMORY = 'bytes_per_object'
+UNITS = {PER_CALL: 'ns/call', THROUGHPUT: 'samples/s', MEMORY: 'B/object'}
+
+
+@dataclass
+class Case:
+    name: str
+    params: Dict[str, Any]
+    metric: str
+    # Returns a function running the benchmark once, and the number of
+    # calls or samples it processes.
+    setup: Callable[[], Tuple[Callable[[], Any], int]]
+
+    @property
+    def key(self) -> str:
+        params = ','.join(f'{k}={v}' for k, v in sorted(self.params.items()))
+        return f'{self.name}[{params}]'
+
+
+@dataclass
+class Suite:
+    cases: List[Case] = field(default_factory=list)
+
+    def add(self, name: str, metric: str, **params: Any):
+        """Decorator registering a setup function as a benchmark case."""
+        def register(setup: Callable[..., Tuple[Callable[[], Any], int]]):
+            self.cases.append(
+                Case(name, params, metric, lambda: setup(**params)))
+            return setup
+        return register
+
+
+suite = Suite()
+
+
+def _signal(dtype: str, size: int = SAMPLES) -> np.ndarray:
+    return np.random.default_rng(0).normal(size=size).astype(dtype)
+
+
+def _per_call(fn: Callable[[Any], Any], xs: np.ndarray):
+    values = xs.tolist() if xs.dtype == np.float64 else list(xs)
+
+    def run():
+        for v in values: fn(v)
+    return run, len(values)
+
+
+def _block(fn: Callable[[np.ndarray], Any], xs: np.ndarray):
+    return lambda: fn(xs), len(xs)
+
+
+def _sos(sections: int) -> np.ndarray:
+    rows = []
+    for k in range(sections):
+        r, t = 0.9 - 0.1 * k / sections, 0.3 + k / sections
+        a = [1, -2 * r * np.cos(t), r**2]
+        rows.append([sum(a) / 4, sum(a) / 2, sum(a) / 4, *a])
+    return np.array(rows)
+
+
+for _n in SIZES:
+    for _dtype in DTYPES:
+        _w = np.ones(_n) / _n
+
+        @suite.add('SMAFilter.__call__', PER_CALL, n=_n, dtype=_dtype)
+        def _(n, dtype): return _per_call(SMAFilter(n), _signal(dtype))
+
+        @suite.add('SMAFilter.process', THROUGHPUT, n=_n, dtype=_dtype)
+        def _(n, dtype): return _block(SMAFilter(n).process, _signal(dtype, BLOCK))  # noqa: E501
+
+        @suite.add('FIRFilter.__call__', PER_CALL, n=_n, dtype=_dtype)
+        def _(n, dtype): return _per_call(FIRFilter(np.ones(n) / n), _signal(dtype))  # noqa: E501
+
+        @suite.add('FIRFilter.process', THROUGHPUT, n=_n, dtype=_dtype)
+        def _(n, dtype): return _block(FIRFilter(np.ones(n) / n).process, _signal(dtype, BLOCK))  # noqa: E501
+
+        @suite.add('MedianFilter.__call__', PER_CALL, n=_n, dtype=_dtype)
+        def _(n, dtype): return _per_call(MedianFilter(n), _signal(dtype))
+
+        @suite.add('SMAFilterBank.__call__', PER_CALL, n=_n, dtype=_dtype)
+        def _(n, dtype):
+            xs = _signal(dtype, SAMPLES * CHANNELS).reshape(-1, CHANNELS)
+            return _per_call(SMAFilterBank(n, CHANNELS, dtype=dtype), xs)
+
+        @suite.add('FIRFilterBank.process', THROUGHPUT, n=_n, dtype=_dtype)
+        def _(n, dtype):
+            xs = _signal(dtype, BLOCK).reshape(-1, CHANNELS)
+            bank = FIRFilterBank(np.ones(n) / n, CHANNELS, dtype=dtype)
+            return lambda: bank.process(xs), xs.size
+
+for _sections in (1, 4):
+    @suite.add('IIRFilter.__call__', PER_CALL, sections=_sections)
+    def _(sections): return _per_call(IIRFilter(_sos(sections)), _signal('float64'))  # noqa: E501
+
+    @suite.add('IIRFilter.process', THROUGHPUT, sections=_sections)
+    def _(sections): return _block(IIRFilter(_sos(sections)).process, _signal('float64', BLOCK))  # noqa: E501
+
+for _dtype in ('bool', 'int64', 'float64'):
+    @suite.add('FlankDetector.step', PER_CALL, dtype=_dtype)
+    def _(dtype):
+        xs = (_signal('float64') > 0).astype(dtype)
+        return _per_call(FlankDetector(0, 1).step, xs)
+
+    @suite.add('FlankDetector.edges', THROUGHPUT, dtype=_dtype)
+    def _(dtype):
+        xs = (_signal('float64', BLOCK) > 0).astype(dtype)
+        return _block(FlankDetector(0, 1).edges, xs)
+
+for _dtype in DTYPES:
+    @suite.add('SchmittTrigger.step', PER_CALL, dtype=_dtype)
+    def _(dtype): return _per_call(SchmittTrigger(-0.5, 0.5).step, _signal(dtype))  # noqa: E501
+
+    @suite.add('SchmittTrigger.edges', THROUGHPUT, dtype=_dtype)
+    def _(dtype): return _block(SchmittTrigger(-0.5, 0.5).edges, _signal(dtype, BLOCK))  # noqa: E501
+
+    @suite.add('Integrator.next', PER_CALL, dtype=_dtype)
+    def _(dtype):
+        i = Integrator()
+        return _per_call(lambda y: i.next(y, 0.001), _signal(dtype))
+
+    @suite.add('Derivator.next', PER_CALL, dtype=_dtype)
+    def _(dtype):
+        d = Derivator()
+        return _per_call(lambda y: d.next(y, 0.001), _signal(dtype))
+
+    @suite.add('Integrator.process', THROUGHPUT, dtype=_dtype)
+    def _(dtype): return _block(lambda ys: Integrator().process(ys, 0.001), _signal(dtype, BLOCK))  # noqa: E501
+
+    @suite.add('Derivator.process', THROUGHPUT, dtype=_dtype)
+    def _(dtype): return _block(lambda ys: Derivator().process(ys, 0.001), _signal(dtype, BLOCK))  # noqa: E501
+
+for _name, _cls, _xs in (('Vec2', Vec2, (3, 4)),
+                         ('SlimVec2', SlimVec2, (3, 4)),
+                         ('Vec3', Vec3, (1, 2, 3)),
+                         ('SlimVec3', SlimVec3, (1, 2, 3))):
+    @suite.add(f'{_name}.__add__', PER_CALL)
+    def _(cls=_cls, xs=_xs):
+        a, b = cls(*xs), cls(*xs)
+        return lambda: [a + b for _ in range(SAMPLES)], SAMPLES
+
+    @suite.add(f'{_name}.euclidean', PER_CALL)
+    def _(cls=_cls, xs=_xs):
+        a = cls(*xs)
+        return lambda: [a.euclidean() for _ in range(SAMPLES)], SAMPLES
+
+    @suite.add(f'{_name}.__init__', MEMORY)
+    def _(cls=_cls, xs=_xs):
+        return lambda: [cls(*xs) for _ in range(SAMPLES)], SAMPLES
+
+
+def measure(case: Case, repeat: int) -> float:
+    """Best of `repeat` runs, in the unit of the cases metric."""
+    run, count = case.setup()
+    if case.metric == MEMORY:
+        tracemalloc.start()
+        objects = run()  # noqa: F841
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size / count
+
+    run()  # Warm up
+    best = min(_timed(run) for _ in range(repeat))
+    if case.metric == PER_CALL: return best / count
+    return count / (best * 1e-9)
+
+
+def _timed(run: Callable[[], Any]) -> int:
+    start = perf_counter_ns()
+    run()
+    return perf_counter_ns() - start
+
+
+def run_suite(pattern: str = '', repeat: int = 5) -> Iterator[Dict[str, Any]]:
+    for case in suite.cases:
+        if pattern not in case.key: continue
+        yield {
+            'key': case.key,
+            'name': case.name,
+            'params': case.params,
+            'metric': case.metric,
+            'value': measure(case, repeat),
+        }
+
+
+def compare(old: Dict[str, Any],
+            new: Dict[str, Any],
+            threshold: float) -> List[Tuple[str, float, bool]]:
+    """Relative change of every benchmark in both results, positive meaning
+    faster, and if it is a regression larger than `threshold`."""
+    before = {r['key']: r for r in old['results']}
+    changes = []
+    for r in new['results']:
+        if r['key'] not in before: continue
+        a, b = before[r['key']]['value'], r['value']
+        change = (b - a) / a if r['metric'] == THROUGHPUT else (a - b) / a
+        changes.append((r['key'], change, change < -threshold))
+    return changes
+
+
+def main(argv: List[str]) -> int:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run benchmarks')
+    run.add_argument('-o', '--output', help='Write results to JSON file')
+    run.add_argument('-k', '--filter', default='',
+                     help='Only run benchmarks containing this string')
+    run.add_argument('-r', '--repeat', type=int, default=5)
+
+    cmp = commands.add_parser('compare', help='Compare two result files')
+    cmp.add_argument('old')
+    cmp.add_argument('new')
+    cmp.add_argument('-t', '--threshold', type=float, default=0.1,
+                     help='Relative slowdown flagged as regression')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = []
+        for r in run_suite(args.filter, args.repeat):
+            print(f'{r["key"]:<60} {r["value"]:>14.1f} {UNITS[r["metric"]]}')
+            results.append(r)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({
+                    'meta': {
+                        'time': datetime.now(timezone.utc).isoformat(),
+                        'python': platform.python_version(),
+                        'numpy': np.__version__,
+                        'machine': platform.machine(),
+                    },
+                    'results': results,
+                }, f, indent=2)
+        return 0
+
+    with open(args.old) as f: old = json.load(f)
+    with open(args.new) as f: new = json.load(f)
+    regressions = 0
+    for key, change, regression in compare(old, new, args.threshold):
+        regressions += regression
+        flag = 'REGRESSION' if regression else ''
+        print(f'{key:<60} {change:>+8.1%} {flag}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
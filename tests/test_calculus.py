@@ -0,0 +1,62 @@
+from numpy import array, full, uint8, zeros
+from numpy.random import default_rng
+from araceae.calculus import Integrator, Derivator
+
+
+def test_integrator():
+    i = Integrator()
+    assert i.next(2, 1) == 1
+    assert i.next(2, 1) == 3
+    assert i.next(0, 2) == 5
+    assert i.value == 5
+
+
+def test_derivator():
+    d = Derivator()
+    assert d.next(2, 1) == -2
+    assert d.next(2, 1) == 0
+    assert d.next(0, 2) == 1
+    assert d.value == 1
+
+
+def test_process():
+    rng = default_rng(0)
+    ys = rng.normal(size=300)
+    dxs = rng.uniform(0.1, 1, size=300)
+
+    for make in (lambda: Integrator(1), lambda: Derivator(1)):
+        for dx in (0.01, dxs):
+            steps = dx if not isinstance(dx, float) else [dx] * len(ys)
+            ref = make()
+            expected = array([ref.next(y, s) for y, s in zip(ys, steps)])
+
+            c = make()
+            a = c.process(ys[:100], dx if isinstance(dx, float) else dx[:100])
+            b = c.process(ys[100:], dx if isinstance(dx, float) else dx[100:])
+            assert (a == expected[:100]).all()
+            assert (b == expected[100:]).all()
+            assert c.value == ref.value
+
+
+def test_array_state():
+    rng = default_rng(1)
+    frames = rng.integers(0, 255, size=(20, 4, 6)).astype(uint8)
+
+    i = Integrator(shape=(4, 6))
+    d = Derivator(zeros((4, 6)))
+    refs = [(Integrator(), Derivator()) for _ in range(24)]
+
+    state = i.value
+    for f in frames[:10]:
+        assert i.next(f, 0.5) is state
+        d.next(f, 0.5)
+    block_i = i.process(frames[10:], 0.5)
+    block_d = d.process(frames[10:], full(10, 0.5))
+    assert block_i.shape == block_d.shape == (10, 4, 6)
+
+    for k, (ri, rd) in enumerate(refs):
+        for f in frames:
+            ri.next(float(f.flat[k]), 0.5)
+            rd.next(float(f.flat[k]), 0.5)
+        assert i.value.flat[k] == ri.value == block_i[-1].flat[k]
+        assert d.value.flat[k] == rd.value == block_d[-1].flat[k]
@@ -1,6 +1,19 @@
-from araceae.signal import FlankDetector as FD, SMAFilter, FIRFilter
+from araceae.signal import (
+    FlankDetector as FD,
+    SchmittTrigger,
+    SMAFilter,
+    FIRFilter,
+    SMAFilterBank,
+    FIRFilterBank,
+    IIRFilter,
+    PercentileFilter,
+    MedianFilter,
+    Pipeline,
+)
 from pytest import raises
-from numpy import array
+from numpy import array, isclose
+from numpy.random import default_rng
+import numpy as np
 
 
 def test_flank1():
@@ -33,6 +46,85 @@ def test_flank2():
     assert fd.step(1) == 1
 
 
+def test_flank_block():
+    for lows, highs in (((1, 3, 5), (2, 4, 6)), ((1.0, 3, 5), (2, 4, 6.0))):
+        x = array([1, 4, 8, 3, 2, 5, 8, 6, 6, 1, 2, 2, 7, 1])
+        ref = FD(lows, highs)
+        rising = [i for i, v in enumerate(x) if ref.is_rising(v, False)]
+        ref = FD(lows, highs)
+        falling = [i for i, v in enumerate(x) if ref.is_falling(v, False)]
+
+        fd = FD(lows, highs)
+        assert list(fd.rising_edges(x[:6], False)) == rising[:2]
+        r, f = fd.edges(x[6:], False)
+        assert list(r + 6) == rising[2:]
+        assert list(fd.falling_edges(x, False)) == falling
+
+        fd = FD(lows, highs)
+        assert list(fd.falling_edges(x, False)) == falling
+        with raises(ValueError):
+            fd.edges(x)
+
+
+def test_flank_bool():
+    x = array([False, True, True, False, True])
+    for lows, highs in ((0, 1), (False, True), ((0, 2), (1, 3))):
+        fd = FD(lows, highs)
+        r, f = fd.edges(x)
+        assert list(r) == [1, 4] and list(f) == [3]
+    fd = FD(False, True)
+    assert fd.step(False) == 0 and fd.is_rising(True)
+
+
+def test_flank_sets():
+    x = array([0, 1, 2, 3, 0])
+    for lows, highs in (({0, 2}, {1, 3}), (frozenset((0, 2)), [1, 3])):
+        fd = FD(lows, highs)
+        assert fd.step(0) == 0 and fd.is_rising(1)
+        r, f = FD(lows, highs).edges(x)
+        assert list(r) == [1, 3] and list(f) == [2, 4]
+
+    x = array([0.5, 1.5, 0.5])
+    fd = FD(frozenset({0.5}), {1.5, 2.5})
+    assert fd.step(0.5) == 0 and fd.is_rising(1.5)
+    r, f = FD(frozenset({0.5}), {1.5, 2.5}).edges(x)
+    assert list(r) == [1] and list(f) == [2]
+
+    fd = FD([], [])
+    with raises(ValueError):
+        fd.step(0)
+    assert fd.step(0, False) is None
+    assert list(fd.edges([1, 2], False)[0]) == []
+
+
+def test_schmitt():
+    st = SchmittTrigger(-0.5, 0.5)
+    assert not st.is_rising(0.4)
+    assert st.is_rising(0.6)
+    assert not st.is_falling(-0.4)
+    assert st.rising_or_falling(-0.5) is False
+    assert st.step(0.0) == 0
+
+    x = np.sin(np.linspace(0, 6 * np.pi, 600))
+    x += default_rng(7).uniform(-0.3, 0.3, size=x.shape)
+    ref = SchmittTrigger(-0.5, 0.5)
+    expected = [ref.rising_or_falling(v) for v in x]
+
+    st = SchmittTrigger(-0.5, 0.5)
+    r1, f1 = st.edges(x[:300])
+    r2, f2 = st.edges(x[300:])
+    rising = np.concatenate((r1, r2 + 300))
+    falling = np.concatenate((f1, f2 + 300))
+    assert list(rising) == [i for i, e in enumerate(expected) if e is True]
+    assert list(falling) == [i for i, e in enumerate(expected) if e is False]
+    assert len(rising) == 3 and len(falling) == 3
+
+    ref = SchmittTrigger(0, 1)
+    st = SchmittTrigger(0, 1)
+    x = [0.5, 1, 0.5, 0, 0.5]
+    assert list(st.levels(x)) == [ref.step(v) for v in x]
+
+
 def test_SMA():
     filt = SMAFilter(3)
 
@@ -73,3 +165,183 @@ def test_FIR2():
     assert round(fir(0), 3) == round(sma(0), 3)
     assert round(fir(0), 3) == round(sma(0), 3)
     assert round(fir(0), 3) == round(sma(0), 3)
+
+
+def test_ring_buffer():
+    rng = default_rng(0)
+    x = rng.normal(size=1000)
+    w = rng.normal(size=17)
+
+    sma = SMAFilter(17)
+    fir = FIRFilter(w)
+    for i, v in enumerate(x):
+        window = x[max(0, i - 16):i + 1][::-1]
+        assert isclose(sma(v), window.sum() / 17)
+        assert isclose(fir(v), np.dot(window, w[:len(window)]))
+
+    sma.lock = True
+    fir.lock = True
+    last = sma.value, fir.value
+    assert (sma(100), fir(100)) == last
+
+
+def test_process():
+    rng = default_rng(1)
+    x = rng.normal(size=500)
+    w = rng.normal(size=9)
+
+    for make in (lambda: SMAFilter(9, 2), lambda: FIRFilter(w, 2)):
+        ref = make()
+        expected = array([ref(v) for v in x])
+
+        filt = make()
+        chunks = [filt.process(c) for c in np.split(x, [3, 4, 100, 250])]
+        assert np.allclose(np.concatenate(chunks), expected)
+        assert isclose(filt.value, ref.value)
+        assert isclose(filt(1), ref(1))
+
+        filt.lock = True
+        assert np.all(filt.process(x[:10]) == filt.value)
+
+
+def test_FIR_fft(monkeypatch):
+    rng = default_rng(2)
+    x = rng.normal(size=3000)
+    w = rng.normal(size=300)
+
+    direct = FIRFilter(w, 1, FIRFilter.MODE_DIRECT)
+    fft = FIRFilter(w, 1)
+    expected = direct.process(x[:1000])
+    assert np.allclose(fft.process(x[:1000]), expected)
+    assert np.allclose(fft.process(x[1000:1001]), direct.process(x[1000:1001]))
+    assert np.allclose(fft.process(x[1001:]), direct.process(x[1001:]))
+    assert isclose(fft(3), direct(3))
+
+    # Short blocks are convolved directly in auto mode
+    calls = []
+    convolve = FIRFilter._FIRFilter__fft_convolve
+    monkeypatch.setattr(FIRFilter, '_FIRFilter__fft_convolve',
+                        lambda f, ext: calls.append(len(ext)) or convolve(f, ext))  # noqa: E501
+    fft.process(x[:1])
+    assert calls == []
+    fft.process(x)
+    assert calls == [len(x) + len(w) - 1]
+
+    small = FIRFilter([1, 2, 3], mode=FIRFilter.MODE_FFT)
+    assert np.allclose(small.process([1, 0, 0, 0]), [1, 2, 3, 0])
+
+    with raises(ValueError):
+        FIRFilter(w, mode=3)
+
+
+def test_filter_bank():
+    rng = default_rng(3)
+    x = rng.normal(size=(200, 4))
+    w = rng.normal(size=7)
+
+    for bank, make in ((SMAFilterBank(7, 4), lambda: SMAFilter(7)),
+                       (FIRFilterBank(w, 4), lambda: FIRFilter(w))):
+        filters = [make() for _ in range(4)]
+        expected = array([[f(v) for f, v in zip(filters, row)] for row in x])
+
+        assert np.allclose([bank(row) for row in x[:50]], expected[:50])
+        assert np.allclose(bank.process(x[50:120]), expected[50:120])
+        assert np.allclose(bank.process(x[120:]), expected[120:])
+        assert np.allclose(bank.value, expected[-1])
+
+    bank32 = FIRFilterBank(w, 4, dtype=np.float32)
+    assert bank32(x[0]).dtype == np.float32
+    assert bank32.process(x).dtype == np.float32
+
+
+def test_IIR():
+    # Two low-pass biquads with poles at 0.9 and 0.7 radius, unit DC gain
+    sos = []
+    for r, t in ((0.9, 0.3), (0.7, 0.5)):
+        a = [1, -2 * r * np.cos(t), r**2]
+        sos.append([sum(a) / 4, sum(a) / 2, sum(a) / 4, *a])
+
+    rng = default_rng(4)
+    x = rng.normal(size=700)
+
+    ref = IIRFilter(sos)
+    expected = array([ref(v) for v in x])
+    filt = IIRFilter(sos)
+    chunks = [filt.process(c) for c in np.split(x, [1, 64, 100, 400])]
+    assert np.allclose(np.concatenate(chunks), expected)
+    assert isclose(filt(1), ref(1))
+
+    held = IIRFilter(sos, 3)
+    assert isclose(held(3), 3)
+    assert np.allclose(held.process(np.full(100, 3)), 3)
+
+    with raises(ValueError):
+        IIRFilter([1, 2, 3])
+
+    # Accumulator, with a pole at z=1
+    acc = IIRFilter([1, 0, 0, 1, -1, 0])
+    assert np.allclose(acc.process(np.ones(5)), [1, 2, 3, 4, 5])
+    with raises(ValueError):
+        IIRFilter([1, 0, 0, 1, -1, 0], 1)
+
+
+def test_percentile():
+    rng = default_rng(5)
+    x = rng.integers(-5, 5, size=600).astype(float)
+    x[300:400] = np.arange(100)
+
+    for n, q in ((1, 50), (6, 50), (7, 0), (7, 100), (8, 30)):
+        filt = PercentileFilter(n, q, 1)
+        history = np.concatenate((np.ones(n - 1), x))
+        expected = [np.percentile(history[i:i + n], q) for i in range(len(x))]
+        assert np.allclose([filt(v) for v in x[:250]], expected[:250])
+        assert np.allclose(filt.process(x[250:450]), expected[250:450])
+        assert np.allclose([filt(v) for v in x[450:]], expected[450:])
+
+        chunked = PercentileFilter(n, q, 1)
+        chunked.CHUNK_SIZE = 20
+        out = np.empty(len(x))
+        assert chunked.process(x, out) is out
+        assert np.allclose(out, expected)
+
+    median = MedianFilter(3)
+    assert [median(v) for v in (1, 100, 2, 3, -50)] == [0, 1, 2, 3, 2]
+
+
+def test_pipeline():
+    rng = default_rng(6)
+    x = rng.normal(size=300)
+    w = rng.normal(size=5)
+
+    def stages():
+        return FIRFilter(w, 1), SMAFilter(4, sum(w)), MedianFilter(3), abs
+
+    ref = stages()
+    expected = []
+    for v in x:
+        for stage in ref:
+            v = stage(v)
+        expected.append(v)
+
+    fused = Pipeline(*stages())
+    assert len(fused.stages) == 3
+    assert isinstance(fused.stages[0], FIRFilter)
+    assert np.allclose([fused(v) for v in x[:100]], expected[:100])
+    assert np.allclose(fused.process(x[100:]), expected[100:])
+    assert isclose(fused.value, expected[-1])
+
+    unfused = Pipeline(FIRFilter(w, 1), SMAFilter(4, 2), fuse=False)
+    assert len(unfused.stages) == 2
+    assert len(Pipeline(FIRFilter(w, 1), SMAFilter(4, 2)).stages) == 2
+
+    # Edge detectors output the held logical level
+    ref = FIRFilter(w), SMAFilter(4), SchmittTrigger(-0.5, 0.5)
+    levels = [ref[2].step(ref[1](ref[0](v))) for v in x]
+    p = Pipeline(FIRFilter(w), SMAFilter(4), SchmittTrigger(-0.5, 0.5))
+    assert [p(v) for v in x[:10]] == levels[:10]
+    assert np.array_equal(p.process(x[10:]), levels[10:])
+
+    p = Pipeline(np.sign, FD(-1, 1), SMAFilter(2))
+    assert np.allclose(p.process([-1, 0, 1, 1, 0, -1]),
+                       [0, 0, 0.5, 1, 1, 0.5])
+    assert p(1) == 0.5
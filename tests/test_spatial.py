@@ -0,0 +1,76 @@
+from numpy.random import default_rng
+from numpy import allclose, array_equal, argsort, abs, sqrt, sum
+from pytest import raises
+from araceae.types import SpatialGrid, Vec2, Vec3, VecArray
+
+
+def brute(points, q, metric):
+    d = points - q
+    if metric == 'manhattan':
+        return sum(abs(d), axis=1)
+    return sqrt(sum(d**2, axis=1))
+
+
+def test_nearest():
+    rng = default_rng(0)
+    points = rng.uniform(-50, 50, size=(500, 2))
+    grid = SpatialGrid(5, VecArray(points))
+    assert len(grid) == 500
+
+    for metric in ('euclidean', 'manhattan'):
+        for q in rng.uniform(-80, 80, size=(20, 2)):
+            d = brute(points, q, metric)
+            ids, dists = grid.nearest(Vec2(*q), 5, metric)
+            assert array_equal(ids, argsort(d, kind='stable')[:5])
+            assert allclose(dists, sorted(d)[:5])
+
+            ids, dists = grid.within(q, 10, metric)
+            assert set(ids) == set((d <= 10).nonzero()[0])
+            assert all(dists[:-1] <= dists[1:])
+
+    ids, dists = grid.nearest_bulk(points[:10], 1)
+    assert array_equal(ids[:, 0], range(10)) and allclose(dists, 0)
+
+
+def test_nearest_far():
+    rng = default_rng(1)
+    points = rng.uniform(0, 100, size=(5000, 2))
+    grid = SpatialGrid(1, points)
+    for q in ((5000, 5000), (-3000, 50), (50, 120)):
+        d = brute(points, q, 'euclidean')
+        ids, dists = grid.nearest(q, 3)
+        assert array_equal(ids, argsort(d, kind='stable')[:3])
+
+    grid = SpatialGrid(1, rng.uniform(0, 10, size=(50, 3)), dim=3)
+    i = grid.insert(Vec3(400, 0, 0))
+    assert grid.nearest((500, 0, 0))[0][0] == i
+    grid.remove(i)
+    assert grid.nearest((500, 0, 0))[0][0] != i
+
+
+def test_update():
+    grid = SpatialGrid(1, dim=3)
+    assert len(grid.nearest((0, 0, 0))[0]) == 0
+
+    a = grid.insert(Vec3(0, 0, 0))
+    b = grid.insert((10, 10, 10))
+    c = grid.insert((2, 2, 2))
+    assert list(grid.nearest((9, 9, 9), 3)[0]) == [b, c, a]
+
+    grid.move(b, (-1, -1, -1))
+    assert list(grid.nearest((9, 9, 9), 3)[0]) == [c, a, b]
+    assert grid[b] == (-1, -1, -1)
+
+    grid.remove(c)
+    assert c not in grid and len(grid) == 2
+    assert list(grid.nearest((9, 9, 9), 3)[0]) == [a, b]
+    assert grid.insert((5, 5, 5)) == c
+
+    for i in range(20):
+        grid.insert((i, 0, 0))
+    assert len(grid) == 23
+
+    with raises(KeyError):
+        grid.remove(100)
+    with raises(ValueError):
+        grid.nearest((0, 0, 0), metric='chebyshev')
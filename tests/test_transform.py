@@ -0,0 +1,47 @@
+from math import pi
+from numpy import allclose, array
+from numpy.random import default_rng
+from araceae.types import Transform, Vec2, Vec3, VecArray, rotation_matrix
+
+
+def test_rotation():
+    r = Transform.rotation(pi / 2)
+    assert r is Transform.rotation(pi / 2)
+    assert allclose(tuple(r.apply(Vec2(1, 0))), (0, 1))
+    assert allclose(r.apply(array([[1, 0], [0, 1]])), [[0, 1], [-1, 0]])
+
+    m = rotation_matrix(pi / 3)
+    assert m is not rotation_matrix(pi / 3)
+    m *= 2
+    assert allclose(rotation_matrix(pi / 3) * 2, m)
+
+    z = Transform.rotation3((0, 0, 2), pi / 2)
+    assert allclose(z.matrix[:2, :2], r.matrix[:2, :2])
+    assert allclose(tuple(z.apply(Vec3(1, 0, 5))), (0, 1, 5))
+    x = Transform.rotation3((1, 0, 0), pi / 2)
+    assert allclose(tuple(x.apply(Vec3(0, 1, 0))), (0, 0, 1))
+
+
+def test_compose():
+    points = VecArray(default_rng(0).normal(size=(50, 2)))
+    t = Transform.translation(1, 2)
+    r = Transform.rotation(0.3)
+    s = Transform.scaling(2, 3)
+
+    chained = s.apply(r.apply(t.apply(points)))
+    composed = t.then(r).then(s)
+    assert allclose(composed.matrix, (s @ r @ t).matrix)
+    assert isinstance(composed.apply(points), VecArray)
+    assert allclose(composed.apply(points).data, chained.data)
+    assert allclose(composed.inverse().apply(chained).data, points.data)
+
+    out = VecArray(points.data.copy())
+    assert composed.apply(points, out) is out
+    assert allclose(out.data, chained.data)
+
+    v = Vec2(1, 1)
+    composed.apply(v, v)
+    assert allclose(tuple(v), tuple(composed.apply(Vec2(1, 1))))
+
+    a = Transform.affine([[0, 1], [1, 0]], (0, 1))
+    assert a.apply([Vec2(1, 2), Vec2(3, 4)]) == [(2, 2), (4, 4)]
@@ -1,6 +1,13 @@
-from araceae.vcwrapper import vccommon, vcfile, vcnull
+from araceae.vcwrapper import (
+    vccommon, vcfile, vcnull, vcparallel, vcasync, LastFrameException)
 from typing import runtime_checkable, Protocol
 from random import randrange
+from time import sleep
+import os
+from numpy import full, uint8, zeros, zeros_like
+from pytest import fixture, raises
+import asyncio
+import cv2
 
 
 @runtime_checkable
@@ -21,3 +28,223 @@ def test_iter():
         x = i
 
     assert x == y - 1
+
+
+@fixture
+def video(tmp_path):
+    path = str(tmp_path / 'test.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'),
+                             10, (32, 24))
+    for i in range(30):
+        writer.write(full((24, 32, 3), i * 8, dtype=uint8))
+    writer.release()
+    return path
+
+
+def test_prefetch(video):
+    expected = [im.mean() for im in vcfile(video)]
+    assert len(expected) == 30
+
+    v = vcfile(video, prefetch=4)
+    assert v.read().mean() == expected[0]
+    assert [im.mean() for im in v] == expected[1:]
+    with raises(LastFrameException):
+        v.read()
+
+    v = vcfile(video, prefetch=2)
+    v.read()
+    sleep(0.1)
+    del v
+
+
+class brokencapture:
+    def __init__(self, file):
+        self.frames = 2
+
+    def read(self, out=None):
+        if not self.frames: raise RuntimeError('broken')
+        self.frames -= 1
+        return True, zeros((4, 4, 3), dtype=uint8)
+
+    def release(self): ...
+
+
+def test_prefetch_error(monkeypatch):
+    monkeypatch.setattr(cv2, 'VideoCapture', brokencapture)
+    v = vcfile('', prefetch=4)
+    v.read()
+    v.read()
+    with raises(RuntimeError):
+        v.read()
+    with raises(LastFrameException):
+        v.read()
+
+
+def test_pool(video):
+    v = vcfile(video, pool=2)
+    first = v.read_pooled()
+    assert first.array.mean() == 0
+    buffer = first.array
+    first.release()
+    first.release()
+
+    with v.read_pooled() as im:
+        assert im is buffer and im.mean() == 8
+    a, b, c = v.read_pooled(), v.read_pooled(), v.read_pooled()
+    assert len({id(a.array), id(b.array), id(c.array)}) == 3
+    assert [f.array.mean() for f in (a, b, c)] == [16, 24, 32]
+
+    out = zeros_like(buffer)
+    assert v.read_into(out) is out and out.mean() == 40
+    assert vcfile(video, prefetch=2).read_into(out) is out and out.mean() == 0
+
+    null = vcnull(4, 4, 1)
+    null.read_into(zeros((4, 4), dtype=uint8))
+    with raises(LastFrameException):
+        null.read_into(zeros((4, 4), dtype=uint8))
+
+
+def test_batch(video):
+    v = vcfile(video)
+    batch = v.read_batch(8)
+    assert batch.shape == (8, 24, 32, 3) and batch.flags.c_contiguous
+    assert [b.mean() for b in batch] == [8 * i for i in range(8)]
+
+    out = zeros((8, 24, 32, 3), dtype=uint8)
+    sizes = [len(b) for b in vcfile(video, prefetch=2).batches(8, out)]
+    assert sizes == [8, 8, 8, 6]
+
+    v = vcfile(video)
+    v.read_batch(28)
+    assert v.read_batch(4).shape == (2, 24, 32, 3)
+    with raises(LastFrameException):
+        v.read_batch(4)
+    with raises(ValueError):
+        v.read_batch(4, out[:2])
+
+    v = vcfile(video)
+    for n in (0, -1):
+        with raises(ValueError):
+            v.read_batch(n)
+    assert v.read().mean() == 0
+
+    assert [b.shape for b in vcnull(4, 4, 5).batches(2)] == [(2, 4, 4)] * 2 + [(1, 4, 4)]  # noqa: E501
+
+
+def test_parallel(video):
+    expected = [im.mean() for im in vcfile(video)]
+
+    v = vcparallel(video, workers=3, chunk=4, slots=2)
+    assert isinstance(v, check_vccommon)
+    assert [im.mean() for im in v] == expected
+    with raises(LastFrameException):
+        v.read()
+
+    v = vcparallel(video, workers=2, ordered=False, chunk=4)
+    frames = dict(v.indexed())
+    assert sorted(frames) == list(range(30))
+    assert [frames[i].mean() for i in range(30)] == expected
+
+    v = vcparallel(video, workers=2, chunk=8)
+    assert [len(b) for b in v.batches(7)] == [7, 7, 7, 7, 2]
+    v.close()
+    v.close()
+    with raises(LastFrameException):
+        v.read()
+
+
+class slownull(vcnull):
+    def read(self):
+        sleep(0.05)
+        return super().read()
+
+
+def test_async(video):
+    expected = [im.mean() for im in vcfile(video)]
+
+    async def frames(source, **kwargs):
+        async with vcasync(source, **kwargs) as vc:
+            return [im.mean() async for im in vc]
+
+    assert asyncio.run(frames(vcfile(video))) == expected
+    assert asyncio.run(frames(vcfile(video), readahead=0)) == expected
+
+    async def cancel(readahead):
+        vc = vcasync(slownull(4, 4, 3), readahead=readahead)
+        with raises(asyncio.TimeoutError):
+            await asyncio.wait_for(vc.read(), 0.01)
+        assert (await vc.read()).shape == (4, 4)
+        assert len([im async for im in vc]) == 2
+        with raises(LastFrameException):
+            await vc.read()
+        await vc.aclose()
+
+    asyncio.run(cancel(0))
+    asyncio.run(cancel(2))
+
+    async def close():
+        vc = vcasync(slownull(4, 4), readahead=1)
+        await vc.read()
+        await vc.aclose()
+        with raises(LastFrameException):
+            await vc.read()
+
+    asyncio.run(close())
+
+
+class wrappedcapture:
+    capture = cv2.VideoCapture
+
+    def __init__(self, file):
+        self.vc = self.capture(file)
+
+    def __getattr__(self, name):
+        return getattr(self.vc, name)
+
+
+def test_parallel_undercount(video, monkeypatch):
+    class undercounted(wrappedcapture):
+        def get(self, prop):
+            if prop == cv2.CAP_PROP_FRAME_COUNT: return 20
+            return self.vc.get(prop)
+
+    expected = [im.mean() for im in vcfile(video)]
+    monkeypatch.setattr(cv2, 'VideoCapture', undercounted)
+    v = vcparallel(video, workers=2, chunk=4)
+    assert [im.mean() for im in v] == expected
+    v = vcparallel(video, workers=3, ordered=False)
+    assert sorted(i for i, _ in v.indexed()) == list(range(30))
+
+
+def test_parallel_errors(video, monkeypatch):
+    class failing(wrappedcapture):
+        def read(self, out=None):
+            if self.vc.get(cv2.CAP_PROP_POS_FRAMES) >= 10:
+                raise ValueError('decode')
+            return self.vc.read(out)
+
+    class dying(wrappedcapture):
+        def read(self, out=None):
+            if self.vc.get(cv2.CAP_PROP_POS_FRAMES) >= 10: os._exit(3)
+            return self.vc.read(out)
+
+    for capture, error, match in ((failing, ValueError, 'decode'),
+                                  (dying, RuntimeError, 'code 3')):
+        monkeypatch.setattr(cv2, 'VideoCapture', capture)
+        for ordered in (True, False):
+            v = vcparallel(video, workers=1, ordered=ordered)
+            with raises(error, match=match):
+                for _ in v: ...
+            with raises(LastFrameException):
+                v.read()
+            v.close()
+
+
+def test_parallel_memory(video, monkeypatch):
+    frame = 24 * 32 * 3
+    for budget, slots in ((frame * 2 * 5, 5), (0, 2), (1 << 30, 8)):
+        monkeypatch.setattr(vcparallel, 'SHARED_MEMORY', budget)
+        v = vcparallel(video, workers=2, chunk=8)
+        assert v._vcparallel__shape[0] == slots
+        assert len(list(v)) == 30
+        v.close()
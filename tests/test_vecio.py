@@ -0,0 +1,68 @@
+from numpy import allclose, float32, memmap
+from numpy.random import default_rng
+from pytest import raises
+from araceae.types import Vec2, Vec3, VecArray
+from araceae.types.vecio import (
+    HEADER_SIZE,
+    VecWriter,
+    dumps,
+    load,
+    loads,
+    save,
+)
+
+
+def test_dumps():
+    data = dumps([Vec2(1, 2), Vec2(3, 4)])
+    assert len(data) == HEADER_SIZE + 4 * 8
+    assert loads(data) == [(1, 2), (3, 4)]
+    assert loads(dumps(Vec3(1, 2, 3), float32)) == [(1, 2, 3)]
+
+    with raises(ValueError):
+        loads(b'not a vector file')
+    with raises(ValueError):
+        dumps([Vec2(1, 2)], int)
+
+
+def test_stream(tmp_path):
+    path = tmp_path / 'track.vec'
+    points = default_rng(0).normal(size=(1000, 2))
+
+    with VecWriter(path, 2) as w:
+        for p in points[:10]:
+            w.write(Vec2(*p))
+    with VecWriter(path, 2) as w:
+        w.write_many(VecArray(points[10:]))
+
+    batch = load(path)
+    assert isinstance(batch.data, memmap)
+    assert batch == points
+    assert batch[3] == tuple(points[3])
+    assert load(path, mmap=False) == points
+
+    with open(path, 'ab') as f:
+        f.write(b'\0\0\0')
+    assert len(load(path)) == 1000
+    with VecWriter(path, 2) as w:
+        w.write((1, 1))
+    assert len(load(path)) == 1001
+
+    with raises(ValueError):
+        VecWriter(path, 3)
+
+
+def test_save_float32(tmp_path):
+    path = tmp_path / 'points.vec'
+    points = default_rng(1).normal(size=(50, 3))
+    save(path, points, float32)
+
+    batch = load(path)
+    assert batch.data.dtype == float32 and batch.dim == 3
+    assert allclose(batch.data, points, atol=1e-6)
+    with raises(ValueError):
+        batch[0] += (1, 1, 1)
+
+    writable = load(path, writable=True)
+    writable[0] *= 0
+    writable.data.flush()
+    assert load(path)[0] == (0, 0, 0)
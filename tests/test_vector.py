@@ -1,14 +1,19 @@
 from math import sqrt, pi
 from random import randrange
-from numpy import array
+from numpy import array, allclose, array_equal, arange, float64
 from pytest import raises
 from araceae.types import (
     Vec,
     Vec2,
     Vec3,
+    VecArray,
+    SlimVec2,
+    SlimVec3,
     euclidean,
     manhattan,
     rotation_matrix,
+    pairwise_distances,
+    paired_distances,
 )
 
 
@@ -135,6 +140,23 @@ def test_immediate_op():
         v += (1, 2, 3)
 
 
+def test_out_ops():
+    v = Vec2(1, 2)
+    u = Vec2(3, 4)
+    out = Vec2(0, 0)
+
+    assert v.add(u, out) is out and out == (4, 6)
+    assert v.sub(u, out) is out and out == (-2, -2)
+    assert v.mul(3, out) is out and out == (3, 6)
+    assert v.matmul(array([[0, 1], [1, 0]]), out) is out and out == (2, 1)
+    assert v.add(u) == (4, 6) and v.add(u) is not out
+    assert v == (1, 2)
+
+    w = abs(Vec3(-1, 2, -3))
+    assert isinstance(w, Vec3) and w == (1, 2, 3)
+    assert isinstance(v + u, Vec2) and (v + u).y == 6
+
+
 def test_reverse():
     v = reversed(Vec(1, 2, 3, 4, 5))
     for i, j in zip(v, (5, 4, 3, 2, 1)):
@@ -147,3 +169,119 @@ def test_contains():
     assert 2 in v
     assert 3 in v
     assert 4 not in v
+
+
+def test_vecarray():
+    a = VecArray([(3, 4), (-1, 2), (0, 0)])
+    b = VecArray.from_vecs([Vec2(1, 1), Vec2(2, 2), Vec2(3, 3)])
+
+    assert len(a) == 3 and a.dim == 2
+    assert allclose(a.euclidean(), [5, sqrt(5), 0])
+    assert allclose(a.manhattan(), [7, 3, 0])
+    assert allclose(a.euclidean(Vec2(3, 4)), [0, sqrt(20), 5])
+    assert allclose(a.manhattan(b), [5, 3, 6])
+    assert (a + b) == [(4, 5), (1, 4), (3, 3)]
+    assert (a - (1, 1)) == [(2, 3), (-2, 1), (-1, -1)]
+    assert (a * 2)[0] == (6, 8)
+    assert list(a < b) == [False, True, True]
+    assert list(a >= Vec2(1, 1)) == [True, True, False]
+    assert a.matmul(array([[-2, 0], [0, -2]])) == [(-6, -8), (2, -4), (0, 0)]
+    assert array_equal(VecArray([(1.9, -1.9)]).as_int_t(), [(1, -1)])
+
+    v = a[0]
+    assert isinstance(v, Vec2) and v.x == 3 and v.y == 4
+    v += (1, 1)
+    assert a[0] == (4, 5)
+    a[1:] += (1, 1)
+    assert a == [(4, 5), (0, 3), (1, 1)]
+
+    vecs = a.to_vecs()
+    vecs[0] *= 0
+    assert vecs[0] == (0, 0) and a[0] == (4, 5)
+
+    i = VecArray(array([[1, 2]]), copy=False)
+    assert i.data.dtype == float64
+    i += (0.5, 0.5)
+    assert i[0] == (1.5, 2.5)
+    f = array([[1.0, 2.0]])
+    assert VecArray(f, copy=False).data is f
+    assert [tuple(v) for v in a] == [(4, 5), (0, 3), (1, 1)]
+
+
+def test_slimvec():
+    for V2, V3 in ((Vec2, Vec3), (SlimVec2, SlimVec3)):
+        v = V2(3, 4)
+        u = V3(1, -2, 3)
+
+        assert v.euclidean() == 5.0 and v.manhattan() == 7
+        assert u.manhattan() == 6 and u.z == 3
+        assert v.matmul(array([[-2, 0], [0, -2]])) == (-6, -8)
+        assert u.matmul(array([[0, 1, 0], [1, 0, 0], [0, 0, 1]])) == (-2, 1, 3)
+        assert tuple(map(round, V2(1, 0).matmul(rotation_matrix(-pi / 4)))) \
+            == (1, 1)
+        assert v + (1, 1) == (4, 5) and v - V2(1, 1) == (2, 3)
+        assert v * 2 == (6, 8) and abs(V2(-1, 1)) == (1, 1)
+        assert v < V2(4, 4) and v >= V2(3, 4) and v != (4, 3)
+        assert v[1] == 4 and 3 in v and list(reversed(u)) == [3, -2, 1]
+        assert V2(1.7, -1.7).as_int_t() == (1, -1)
+
+        v += (1, 1)
+        v *= 2
+        v -= (0, 2)
+        v[0] = 9
+        assert v == (9, 8)
+
+        with raises(AssertionError):
+            _ = v + (1, 2, 3)
+
+    assert not hasattr(SlimVec2(1, 2), '__dict__')
+
+
+def test_pairwise_distances():
+    a = [Vec2(randrange(-10, 10), randrange(-10, 10)) for _ in range(30)]
+    b = VecArray([(randrange(-10, 10), randrange(-10, 10)) for _ in range(7)])
+
+    e = pairwise_distances(a, b, chunk_size=10)
+    m = pairwise_distances(a, b.data, 'manhattan')
+    assert e.shape == m.shape == (30, 7)
+    for i, u in enumerate(a):
+        for j, v in enumerate(b):
+            assert abs(e[i, j] - euclidean(u, v)) < 1e-9
+            assert m[i, j] == manhattan(u, v)
+
+    assert allclose(pairwise_distances(a, squared=True),
+                    pairwise_distances(a)**2)
+    assert allclose(paired_distances(a[:7], b), e.diagonal())
+    assert allclose(paired_distances(a[:7], b, 'manhattan'), m.diagonal())
+
+    with raises(ValueError):
+        pairwise_distances(a, metric='manhattan', squared=True)
+
+
+def test_views():
+    data = arange(12, dtype=float).reshape(4, 3)
+    v = Vec3.view(data[1])
+    assert v == (3, 4, 5)
+    v += (1, 1, 1)
+    assert list(data[1]) == [4, 5, 6]
+    data[1, 0] = 0
+    assert v.x == 0
+
+    buf = bytearray(array([1, 2, 3, 4], dtype=float).tobytes())
+    u = Vec2.from_buffer(buf, offset=16)
+    assert u == (3, 4)
+    u *= 2
+    assert Vec.from_buffer(buf) == (1, 2, 6, 8)
+
+    batch = VecArray.from_buffer(buf, 2)
+    assert batch == [(1, 2), (6, 8)]
+    batch += (1, 1)
+    assert Vec.from_buffer(buf) == (2, 3, 7, 9)
+
+    frozen = Vec2.from_buffer(bytes(buf))
+    with raises(ValueError):
+        frozen *= 2
+    with raises(ValueError):
+        Vec2.view(data[0])
+    with raises(ValueError):
+        Vec.view(arange(3))